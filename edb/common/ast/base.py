@@ -109,6 +109,8 @@ if debug.flags.typecheck:
 else:
     _check_type = _check_type_passthrough
 
+_should_check_types = __debug__ and _check_type is _check_type_real
+
 
 class AST:
     # These use type comments because type annotations are interpreted
@@ -233,8 +235,7 @@ class AST:
             if field_name not in kwargs:
                 kwargs[field_name] = factory()
 
-        should_check_types = __debug__ and _check_type is _check_type_real
-        if should_check_types:
+        if _should_check_types:
             for k, v in kwargs.items():
                 self.check_field_type(self._fields[k], v)
 
@@ -266,7 +267,7 @@ class AST:
             if name in self.__ast_frozen_fields__:
                 raise TypeError(f'cannot set immutable {name} on {self!r}')
 
-    if __debug__ and _check_type is _check_type_real:
+    if _should_check_types:
         __setattr__ = _checked_setattr
 
     def check_field_type(self, field, value):
@@ -308,14 +309,15 @@ def serialize_to_markup(ast, *, ctx):
     include_meta = ctx.kwargs.get('_ast_include_meta', True)
     exclude_unset = ctx.kwargs.get('_ast_exclude_unset', True)
 
+    field_specs = ast._fields
     fields = iter_fields(
         ast, include_meta=include_meta, exclude_unset=exclude_unset)
     for fieldname, field in fields:
-        if ast._fields[fieldname].hidden:
+        field_spec = field_specs[fieldname]
+        if field_spec.hidden:
+            continue
+        if field is None and field_spec.meta:
             continue
-        if field is None:
-            if ast._fields[fieldname].meta:
-                continue
         node.add_child(label=fieldname, node=markup.serialize(field, ctx=ctx))
 
     return node
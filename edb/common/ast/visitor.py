@@ -19,6 +19,7 @@
 
 from __future__ import annotations
 
+import functools
 from typing import *
 
 from edb.common import typeutils
@@ -57,9 +58,13 @@ def find_children(node, test_func, *args,
         except SkipNode:
             return False
 
-        for field, value in base.iter_fields(node, include_meta=False):
-            field_spec = node._fields[field]
-            if field_spec.hidden:
+        for field_name, field_spec in node._fields.items():
+            if field_spec.hidden or field_spec.meta:
+                continue
+
+            # Unset optional fields are common and have nothing to visit.
+            value = getattr(node, field_name, None)
+            if value is None:
                 continue
 
             if _find_children(value):
@@ -77,6 +82,15 @@ def find_children(node, test_func, *args,
         return result
 
 
+@functools.lru_cache(maxsize=None)
+def _find_visitor_method(visitor_cls, node_cls):
+    for cls in node_cls.__mro__:
+        method = 'visit_' + cls.__name__
+        if getattr(visitor_cls, method, None) is not None:
+            return method
+    return None
+
+
 class NodeVisitor:
     """Walk the AST and call a visitor function for every node found.
 
@@ -135,11 +149,9 @@ class NodeVisitor:
         else:
             self.memo[node] = None
 
-        for cls in node.__class__.__mro__:
-            method = 'visit_' + cls.__name__
-            visitor = getattr(self, method, None)
-            if visitor is not None:
-                break
+        method = _find_visitor_method(type(self), type(node))
+        if method is not None:
+            visitor = getattr(self, method)
         else:
             visitor = self.generic_visit
         result = visitor(node)
@@ -49,6 +49,7 @@ from .options import GlobalCompilerOptions
 
 if TYPE_CHECKING:
     from edb.schema import objtypes as s_objtypes
+    from edb.schema import pseudo as s_pseudo
     from edb.schema import sources as s_sources
 
 
@@ -156,6 +157,12 @@ class Environment:
     inferred_types: Dict[irast.Base, s_types.Type]
     """A dictionary of all expressions and their inferred schema types."""
 
+    builtin_types: Dict[str, s_obj.Object]
+    """A cache of frequently used builtin schema objects, keyed by name."""
+
+    pseudo_types: Dict[str, s_pseudo.PseudoType]
+    """A cache of frequently used pseudo-types, keyed by name."""
+
     inferred_volatility: Dict[
         irast.Base,
         InferredVolatility]
@@ -247,6 +254,8 @@ class Environment:
         self.set_types = {}
         self.type_origins = {}
         self.inferred_types = {}
+        self.builtin_types = {}
+        self.pseudo_types = {}
         self.inferred_volatility = {}
         self.view_shapes = collections.defaultdict(list)
         self.view_shapes_metadata = collections.defaultdict(
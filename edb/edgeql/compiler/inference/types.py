@@ -23,7 +23,6 @@ import functools
 from typing import *
 
 from edb import errors
-from edb.common.typeutils import not_none
 
 from edb.schema import abc as s_abc
 from edb.schema import name as s_name
@@ -40,6 +39,37 @@ from edb.ir import typeutils as irtyputils
 from .. import context
 
 
+def _get_builtin_type(
+    name: str,
+    objtype: Type[s_obj.Object_T],
+    env: context.Environment,
+) -> s_obj.Object_T:
+    # Builtin objects are never altered during the compilation,
+    # so it is safe to resolve them once per environment.
+    obj = env.builtin_types.get(name)
+    if obj is None:
+        obj = env.schema.get(name, type=objtype)
+        env.builtin_types[name] = obj
+    assert isinstance(obj, objtype)
+    return obj
+
+
+def _get_pseudo_type(
+    name: str,
+    env: context.Environment,
+) -> s_pseudo.PseudoType:
+    obj = env.pseudo_types.get(name)
+    if obj is None:
+        obj = s_pseudo.PseudoType.get(env.schema, name)
+        env.pseudo_types[name] = obj
+    return obj
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_derived_name(alias: str) -> s_name.QualName:
+    return s_name.QualName(module='__derived__', name=alias)
+
+
 def amend_empty_set_type(
     es: irast.EmptySet,
     t: s_types.Type,
@@ -47,13 +77,18 @@ def amend_empty_set_type(
 ) -> None:
     env.set_types[es] = t
     alias = es.path_id.target_name_hint.name
-    typename = s_name.QualName(module='__derived__', name=alias)
+    typename = _get_derived_name(alias)
     es.path_id = irast.PathId.from_type(
         env.schema, t, env=env, typename=typename,
         namespace=es.path_id.namespace,
     )
 
 
+_KIND_OBJECT = 1 << 0
+_KIND_SCALAR = 1 << 1
+_KIND_COLL = 1 << 2
+
+
 def _infer_common_type(
     irs: List[irast.Base],
     env: context.Environment
@@ -64,27 +99,27 @@ def _infer_common_type(
             context=irs[0].context)
 
     types = []
-    empties = []
+    empties: List[irast.EmptySet] = []
 
-    seen_object = False
-    seen_scalar = False
-    seen_coll = False
+    # A bitmask of _KIND_* flags of all seen types.
+    kinds = 0
 
-    for i, arg in enumerate(irs):
+    for arg in irs:
         if isinstance(arg, irast.EmptySet) and env.set_types[arg] is None:
-            empties.append(i)
+            empties.append(arg)
             continue
 
         t = infer_type(arg, env)
         if isinstance(t, s_abc.Collection):
-            seen_coll = True
+            kinds |= _KIND_COLL
         elif isinstance(t, s_scalars.ScalarType):
-            seen_scalar = True
+            kinds |= _KIND_SCALAR
         else:
-            seen_object = True
+            kinds |= _KIND_OBJECT
         types.append(t)
 
-    if seen_coll + seen_scalar + seen_object > 1:
+    if kinds & (kinds - 1):
+        # More than one kind of type.
         raise errors.QueryError(
             'cannot determine common type',
             context=irs[0].context)
@@ -94,22 +129,27 @@ def _infer_common_type(
             'cannot determine common type of an empty set',
             context=irs[0].context)
 
-    common_type = None
-    if seen_scalar or seen_coll:
+    common_type: Optional[s_types.Type]
+    if len(types) == 1:
+        # The common type of a single type is the type itself,
+        # regardless of its kind.
+        common_type = types[0]
+    elif kinds & (_KIND_SCALAR | _KIND_COLL):
+        # Thread the schema through the fold locally and store
+        # it back into the environment once.
+        schema = env.schema
         it = iter(types)
         common_type = next(it)
-        while True:
-            next_type = next(it, None)
-            if next_type is None:
-                break
-            env.schema, common_type = (
+        for next_type in it:
+            schema, common_type = (
                 common_type.find_common_implicitly_castable_type(
                     next_type,
-                    env.schema,
+                    schema,
                 )
             )
             if common_type is None:
                 break
+        env.schema = schema
     else:
         common_types = s_utils.get_class_nearest_common_ancestors(
             env.schema,
@@ -121,13 +161,24 @@ def _infer_common_type(
     if common_type is None:
         return None
 
-    for i in empties:
-        amend_empty_set_type(
-            cast(irast.EmptySet, irs[i]), common_type, env)
+    for empty in empties:
+        amend_empty_set_type(empty, common_type, env)
 
     return common_type
 
 
+def _typeref_to_type(
+    typeref: irast.TypeRef,
+    env: context.Environment,
+) -> s_types.Type:
+    if not typeref.collection and type(typeref) is irast.TypeRef:
+        # Fast path: a plain reference to an existing schema type.
+        return env.schema.get_by_id(typeref.id, type=s_types.Type)
+    else:
+        env.schema, t = irtyputils.ir_typeref_to_type(env.schema, typeref)
+        return t
+
+
 @functools.singledispatch
 def _infer_type(
     ir: irast.Base,
@@ -161,35 +212,43 @@ def __infer_set(
     return env.set_types[ir]
 
 
+# Introspection types of collection type references,
+# keyed by collection name.
+_introspection_collection_types = {
+    s_types.Array.schema_name: 'schema::Array',
+    s_types.Tuple.schema_name: 'schema::Tuple',
+}
+
+
 @_infer_type.register
 def __infer_type_introspection(
     ir: irast.TypeIntrospection,
     env: context.Environment,
 ) -> s_types.Type:
-    if irtyputils.is_scalar(ir.typeref):
-        return cast(s_objtypes.ObjectType,
-                    env.schema.get('schema::ScalarType'))
-    elif irtyputils.is_object(ir.typeref):
-        return cast(s_objtypes.ObjectType,
-                    env.schema.get('schema::ObjectType'))
-    elif irtyputils.is_array(ir.typeref):
-        return cast(s_objtypes.ObjectType,
-                    env.schema.get('schema::Array'))
-    elif irtyputils.is_tuple(ir.typeref):
-        return cast(s_objtypes.ObjectType,
-                    env.schema.get('schema::Tuple'))
+    typeref = ir.typeref
+    name: Optional[str]
+    if irtyputils.is_scalar(typeref):
+        name = 'schema::ScalarType'
+    elif typeref.collection:
+        name = _introspection_collection_types.get(typeref.collection)
+    elif not irtyputils.is_generic(typeref):
+        name = 'schema::ObjectType'
     else:
+        name = None
+
+    if name is None:
         raise errors.QueryError(
             'unexpected type in INTROSPECT', context=ir.context)
 
+    return _get_builtin_type(name, s_objtypes.ObjectType, env)
+
 
 @_infer_type.register
 def __infer_func_call(
     ir: irast.FunctionCall,
     env: context.Environment,
 ) -> s_types.Type:
-    env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-    return t
+    return _typeref_to_type(ir.typeref, env)
 
 
 @_infer_type.register
@@ -197,8 +256,7 @@ def __infer_oper_call(
     ir: irast.OperatorCall,
     env: context.Environment,
 ) -> s_types.Type:
-    env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-    return t
+    return _typeref_to_type(ir.typeref, env)
 
 
 @_infer_type.register
@@ -206,8 +264,7 @@ def __infer_const(
     ir: irast.BaseConstant,
     env: context.Environment,
 ) -> s_types.Type:
-    env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-    return t
+    return _typeref_to_type(ir.typeref, env)
 
 
 @_infer_type.register
@@ -215,8 +272,7 @@ def __infer_const_set(
     ir: irast.ConstantSet,
     env: context.Environment,
 ) -> s_types.Type:
-    env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-    return t
+    return _typeref_to_type(ir.typeref, env)
 
 
 @_infer_type.register
@@ -224,8 +280,7 @@ def __infer_param(
     ir: irast.Parameter,
     env: context.Environment,
 ) -> s_types.Type:
-    env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-    return t
+    return _typeref_to_type(ir.typeref, env)
 
 
 def _infer_binop_args(
@@ -234,6 +289,14 @@ def _infer_binop_args(
     env: context.Environment
 ) -> Tuple[s_types.Type, s_types.Type]:
 
+    # Fast path for the common case of neither operand being
+    # an empty set.  EmptySet has no subclasses, so an exact type
+    # check is sufficient.
+    if type(left) is not irast.EmptySet and type(right) is not irast.EmptySet:
+        infer_type(left, env)
+        right_type = infer_type(right, env)
+        return right_type, right_type
+
     if isinstance(left, irast.EmptySet):
         inferred_left_type = None
     else:
@@ -265,8 +328,8 @@ def __infer_typecheckop(
     ir: irast.TypeCheckOp,
     env: context.Environment,
 ) -> s_types.Type:
-    left_type, right_type = _infer_binop_args(ir.left, ir.right, env)
-    return cast(s_scalars.ScalarType, env.schema.get('std::bool'))
+    _infer_binop_args(ir.left, ir.right, env)
+    return _get_builtin_type('std::bool', s_scalars.ScalarType, env)
 
 
 @_infer_type.register
@@ -274,7 +337,7 @@ def __infer_anytyperef(
     ir: irast.AnyTypeRef,
     env: context.Environment,
 ) -> s_types.Type:
-    return s_pseudo.PseudoType.get(env.schema, 'anytype')
+    return _get_pseudo_type('anytype', env)
 
 
 @_infer_type.register
@@ -282,7 +345,46 @@ def __infer_anytupleref(
     ir: irast.AnyTupleRef,
     env: context.Environment,
 ) -> s_types.Type:
-    return s_pseudo.PseudoType.get(env.schema, 'anytuple')
+    return _get_pseudo_type('anytuple', env)
+
+
+def _infer_tuple_typeref(
+    ir: irast.TypeRef,
+    env: context.Environment,
+) -> s_types.Type:
+    # Tuple element typerefs are either all named or all unnamed,
+    # so the element keys can be determined in a single pass.
+    named = False
+    eltypes = {}
+    for i, st in enumerate(ir.subtypes):
+        if st.element_name:
+            named = True
+            key = st.element_name
+        else:
+            key = str(i)
+        eltypes[key] = infer_type(st, env)
+
+    env.schema, result = s_types.Tuple.create(
+        env.schema, element_types=eltypes, named=named)
+    return result
+
+
+def _infer_array_typeref(
+    ir: irast.TypeRef,
+    env: context.Environment,
+) -> s_types.Type:
+    env.schema, result = s_types.Array.from_subtypes(
+        env.schema, [infer_type(t, env) for t in ir.subtypes])
+    return result
+
+
+_typeref_collection_handlers: Dict[
+    str,
+    Callable[[irast.TypeRef, context.Environment], s_types.Type],
+] = {
+    s_types.Tuple.schema_name: _infer_tuple_typeref,
+    s_types.Array.schema_name: _infer_array_typeref,
+}
 
 
 @_infer_type.register
@@ -290,33 +392,16 @@ def __infer_typeref(
     ir: irast.TypeRef,
     env: context.Environment,
 ) -> s_types.Type:
-    result: s_types.Type
-
     if ir.collection:
-        coll = s_types.Collection.get_class(ir.collection)
-        if issubclass(coll, s_types.Tuple):
-            named = False
-            if any(t.element_name for t in ir.subtypes):
-                named = True
-
-            if named:
-                eltypes = {not_none(st.element_name): infer_type(st, env)
-                           for st in ir.subtypes}
-            else:
-                eltypes = {str(i): infer_type(st, env)
-                           for i, st in enumerate(ir.subtypes)}
-
-            env.schema, result = coll.create(
-                env.schema, element_types=eltypes, named=named)
-        else:
-            env.schema, result = coll.from_subtypes(
-                env.schema, [infer_type(t, env) for t in ir.subtypes])
+        handler = _typeref_collection_handlers.get(ir.collection)
+        if handler is None:
+            raise errors.SchemaError(
+                f'unknown collection type: {ir.collection!r}')
+        return handler(ir, env)
     else:
         t = env.schema.get_by_id(ir.id)
         assert isinstance(t, s_types.Type)
-        result = t
-
-    return result
+        return t
 
 
 @_infer_type.register
@@ -381,7 +466,7 @@ def __infer_config_reset(
     env: context.Environment,
 ) -> s_types.Type:
     # This is nonsense but we need to return /something/
-    return s_pseudo.PseudoType.get(env.schema, 'anytype')
+    return _get_pseudo_type('anytype', env)
 
 
 @_infer_type.register
@@ -391,10 +476,10 @@ def __infer_slice(
 ) -> s_types.Type:
     node_type = infer_type(ir.expr, env)
 
-    str_t = cast(s_scalars.ScalarType, env.schema.get('std::str'))
-    int_t = cast(s_scalars.ScalarType, env.schema.get('std::int64'))
-    json_t = cast(s_scalars.ScalarType, env.schema.get('std::json'))
-    bytes_t = cast(s_scalars.ScalarType, env.schema.get('std::bytes'))
+    str_t = _get_builtin_type('std::str', s_scalars.ScalarType, env)
+    int_t = _get_builtin_type('std::int64', s_scalars.ScalarType, env)
+    json_t = _get_builtin_type('std::json', s_scalars.ScalarType, env)
+    bytes_t = _get_builtin_type('std::bytes', s_scalars.ScalarType, env)
 
     if node_type.issubclass(env.schema, str_t):
         base_name = 'string'
@@ -434,73 +519,67 @@ def __infer_index(
     node_type = infer_type(ir.expr, env)
     index_type = infer_type(ir.index, env)
 
-    str_t = cast(s_scalars.ScalarType, env.schema.get('std::str'))
-    bytes_t = cast(s_scalars.ScalarType, env.schema.get('std::bytes'))
-    int_t = cast(s_scalars.ScalarType, env.schema.get('std::int64'))
-    json_t = cast(s_scalars.ScalarType, env.schema.get('std::json'))
+    str_t = _get_builtin_type('std::str', s_scalars.ScalarType, env)
+    bytes_t = _get_builtin_type('std::bytes', s_scalars.ScalarType, env)
+    int_t = _get_builtin_type('std::int64', s_scalars.ScalarType, env)
+    json_t = _get_builtin_type('std::json', s_scalars.ScalarType, env)
 
-    result: s_types.Type
+    schema = env.schema
+    # Most index kinds require an integer index, so check that once.
+    index_is_int = index_type.implicitly_castable_to(int_t, schema)
 
-    if node_type.issubclass(env.schema, str_t):
+    result: s_types.Type
+    # Name of the indexed type if the index must be an integer.
+    int_indexed: Optional[str] = None
 
-        if not index_type.implicitly_castable_to(int_t, env.schema):
-            raise errors.QueryError(
-                f'cannot index string by '
-                f'{index_type.get_displayname(env.schema)}, '
-                f'{int_t.get_displayname(env.schema)} was expected',
-                context=ir.index.context)
+    # Arrays go first, as the isinstance() check is the cheapest
+    # and arrays are never subclasses of the scalar types below.
+    if isinstance(node_type, s_types.Array):
+        int_indexed = 'array'
+        result = node_type.get_subtypes(schema)[0]
 
+    elif node_type.issubclass(schema, str_t):
+        int_indexed = 'string'
         result = str_t
 
-    elif node_type.issubclass(env.schema, bytes_t):
+    elif node_type.issubclass(schema, json_t):
 
-        if not index_type.implicitly_castable_to(int_t, env.schema):
-            raise errors.QueryError(
-                f'cannot index bytes by '
-                f'{index_type.get_displayname(env.schema)}, '
-                f'{int_t.get_displayname(env.schema)} was expected',
-                context=ir.index.context)
-
-        result = bytes_t
-
-    elif node_type.issubclass(env.schema, json_t):
-
-        if not (index_type.implicitly_castable_to(int_t, env.schema) or
-                index_type.implicitly_castable_to(str_t, env.schema)):
+        if not (index_is_int or
+                index_type.implicitly_castable_to(str_t, schema)):
 
             raise errors.QueryError(
                 f'cannot index json by '
-                f'{index_type.get_displayname(env.schema)}, '
-                f'{int_t.get_displayname(env.schema)} or '
-                f'{str_t.get_displayname(env.schema)} was expected',
+                f'{index_type.get_displayname(schema)}, '
+                f'{int_t.get_displayname(schema)} or '
+                f'{str_t.get_displayname(schema)} was expected',
                 context=ir.index.context)
 
         result = json_t
 
-    elif isinstance(node_type, s_types.Array):
-
-        if not index_type.implicitly_castable_to(int_t, env.schema):
-            raise errors.QueryError(
-                f'cannot index array by '
-                f'{index_type.get_displayname(env.schema)}, '
-                f'{int_t.get_displayname(env.schema)} was expected',
-                context=ir.index.context)
-
-        result = node_type.get_subtypes(env.schema)[0]
+    elif node_type.issubclass(schema, bytes_t):
+        int_indexed = 'bytes'
+        result = bytes_t
 
-    elif (node_type.is_any(env.schema) or
+    elif (node_type.is_any(schema) or
             (node_type.is_scalar() and
-                str(node_type.get_name(env.schema)) == 'std::anyscalar') and
-            (index_type.implicitly_castable_to(int_t, env.schema) or
-                index_type.implicitly_castable_to(str_t, env.schema))):
-        result = s_pseudo.PseudoType.get(env.schema, 'anytype')
+                str(node_type.get_name(schema)) == 'std::anyscalar') and
+            (index_is_int or
+                index_type.implicitly_castable_to(str_t, schema))):
+        result = _get_pseudo_type('anytype', env)
 
     else:
         raise errors.QueryError(
             f'index indirection cannot be applied to '
-            f'{node_type.get_verbosename(env.schema)}',
+            f'{node_type.get_verbosename(schema)}',
             context=ir.expr.context)
 
+    if int_indexed is not None and not index_is_int:
+        raise errors.QueryError(
+            f'cannot index {int_indexed} by '
+            f'{index_type.get_displayname(schema)}, '
+            f'{int_t.get_displayname(schema)} was expected',
+            context=ir.index.context)
+
     return result
 
 
@@ -510,15 +589,14 @@ def __infer_array(
     env: context.Environment,
 ) -> s_types.Type:
     if ir.typeref is not None:
-        env.schema, t = irtyputils.ir_typeref_to_type(env.schema, ir.typeref)
-        return t
+        return _typeref_to_type(ir.typeref, env)
     elif ir.elements:
         element_type = _infer_common_type(ir.elements, env)
         if element_type is None:
             raise errors.QueryError('could not determine array type',
                                     context=ir.context)
     else:
-        element_type = s_pseudo.PseudoType.get(env.schema, 'anytype')
+        element_type = _get_pseudo_type('anytype', env)
 
     env.schema, arr_t = s_types.Array.create(
         env.schema,
@@ -539,25 +617,41 @@ def __infer_tuple(
     return tup
 
 
+_InferTypeHandler = Callable[[Any, context.Environment], s_types.Type]
+
+# A type(ir) -> handler mapping to bypass the singledispatch wrapper
+# on every infer_type() call.  Seeded with the registered handlers
+# and memoizes the resolution for their subclasses on first use.
+_infer_type_dispatch: Dict[type, _InferTypeHandler] = {
+    cls: handler
+    for cls, handler in _infer_type.registry.items()
+    if cls is not object
+}
+
+
 def infer_type(ir: irast.Base, env: context.Environment) -> s_types.Type:
-    result = env.inferred_types.get(ir)
+    inferred_types = env.inferred_types
+    result = inferred_types.get(ir)
     if result is not None:
+        # Cached results have been validated on insertion.
         return result
 
-    result = _infer_type(ir, env)
+    ir_cls = type(ir)
+    handler = _infer_type_dispatch.get(ir_cls)
+    if handler is None:
+        handler = _infer_type.dispatch(ir_cls)
+        _infer_type_dispatch[ir_cls] = handler
 
-    if (result is not None and
-            not isinstance(result, (s_obj.Object, s_obj.ObjectMeta))):
-
-        raise errors.QueryError(
-            f'infer_type({ir!r}) retured {result!r} instead of a Object',
-            context=ir.context)
+    result = handler(ir, env)
 
     if result is None:
         raise errors.QueryError(
             'could not determine expression type',
             context=ir.context)
 
-    env.inferred_types[ir] = result
+    assert isinstance(result, (s_obj.Object, s_obj.ObjectMeta)), (
+        f'infer_type({ir!r}) retured {result!r} instead of a Object')
+
+    inferred_types[ir] = result
 
     return result
@@ -66,6 +66,7 @@ Set (
 from __future__ import annotations
 
 import dataclasses
+import functools
 import typing
 import uuid
 
@@ -126,9 +127,9 @@ class TypeRef(ImmutableBase):
     # If this is a scalar type, base_type would be the highest
     # non-abstract base type.
     base_type: typing.Optional[TypeRef] = None
-    # A set of type descendant descriptors, if necessary for
+    # A tuple of type descendant descriptors, if necessary for
     # this type description.
-    descendants: typing.Optional[typing.FrozenSet[TypeRef]] = None
+    descendants: typing.Optional[typing.Tuple[TypeRef, ...]] = None
     # A set of type ancestor descriptors, if necessary for
     # this type description.
     ancestors: typing.Optional[typing.FrozenSet[TypeRef]] = None
@@ -193,10 +194,9 @@ class BasePointerRef(ImmutableBase):
 
     # cardinality fields need to be mutable for lazy cardinality inference.
     # and children because we update pointers with newly derived children
-    __ast_mutable_fields__ = frozenset(
-        ('in_cardinality', 'out_cardinality', 'children',
-         'is_computable')
-    )
+    __ast_mutable_fields__ = frozenset({
+        'in_cardinality', 'out_cardinality', 'children', 'is_computable',
+    })
 
     # The defaults set here are mostly to try to reduce debug spew output.
     name: sn.QualName
@@ -245,9 +245,13 @@ class BasePointerRef(ImmutableBase):
         return self.out_cardinality.to_schema_value()[0]
 
     def descendants(self) -> typing.Set[BasePointerRef]:
-        res = set(self.children)
-        for child in self.children:
-            res.update(child.descendants())
+        res: typing.Set[BasePointerRef] = set()
+        stack = list(self.children)
+        while stack:
+            child = stack.pop()
+            if child not in res:
+                res.add(child)
+                stack.extend(child.children)
         return res
 
     def __repr__(self) -> str:
@@ -263,6 +267,11 @@ class ConstraintRef(ImmutableBase):
     id: uuid.UUID
 
 
+@functools.lru_cache(maxsize=1024)
+def _get_tuple_indirection_name(element_name: str) -> sn.QualName:
+    return sn.QualName(module='__tuple__', name=str(element_name))
+
+
 class TupleIndirectionLink(s_pointers.PseudoPointer):
     """A Link-alike that can be used in tuple indirection path ids."""
 
@@ -275,8 +284,7 @@ class TupleIndirectionLink(s_pointers.PseudoPointer):
     ) -> None:
         self._source = source
         self._target = target
-        self._name = sn.QualName(
-            module='__tuple__', name=str(element_name))
+        self._name = _get_tuple_indirection_name(element_name)
 
     def __hash__(self) -> int:
         return hash((self.__class__, self._name))
@@ -327,6 +335,9 @@ class TupleIndirectionPointerRef(BasePointerRef):
 class TypeIntersectionLink(s_pointers.PseudoPointer):
     """A Link-alike that can be used in type intersection path ids."""
 
+    _optional_name = sn.QualName(module='__type__', name='optindirection')
+    _required_name = sn.QualName(module='__type__', name='indirection')
+
     def __init__(
         self,
         source: so.Object,
@@ -338,8 +349,8 @@ class TypeIntersectionLink(s_pointers.PseudoPointer):
         rptr_specialization: typing.Iterable[PointerRef] = (),
         cardinality: qltypes.SchemaCardinality,
     ) -> None:
-        name = 'optindirection' if optional else 'indirection'
-        self._name = sn.QualName(module='__type__', name=name)
+        self._name = (
+            self._optional_name if optional else self._required_name)
         self._source = source
         self._target = target
         self._cardinality = cardinality
@@ -415,9 +426,10 @@ class Pointer(Base):
     anchor: typing.Optional[str] = None
     show_as_anchor: typing.Optional[str] = None
 
-    @property
+    @functools.cached_property
     def is_inbound(self) -> bool:
-        return self.direction == s_pointers.PointerDirection.Inbound
+        # The direction of a pointer never changes after construction.
+        return self.direction is s_pointers.PointerDirection.Inbound
 
     @property
     def dir_cardinality(self) -> qltypes.Cardinality:
@@ -484,6 +496,8 @@ class Command(Base):
 class Param:
     """Query parameter with it's schema type and IR type"""
 
+    __slots__ = ('name', 'required', 'schema_type', 'ir_type')
+
     name: str
     """Parameter name"""
 
@@ -496,6 +510,16 @@ class Param:
     ir_type: TypeRef
     """IR type reference"""
 
+    # A frozen dataclass with __slots__ cannot restore its state through
+    # the default copy/pickle machinery, which goes through the frozen
+    # __setattr__, so spell out what dataclass(slots=True) generates.
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
 
 class MaterializeVolatile(typing.NamedTuple):
     pass
@@ -555,6 +579,10 @@ class EmptySet(Set, ConstExpr):
     pass
 
 
+# A placeholder for statement parts that are filled in later.
+_PLACEHOLDER_SET = EmptySet()  # type: ignore
+
+
 class BaseConstant(ConstExpr, ImmutableExpr):
     __abstract_node__ = True
     value: typing.Any
@@ -657,7 +685,7 @@ class CallArg(ImmutableBase):
     """Call argument."""
 
     # cardinality fields need to be mutable for lazy cardinality inference.
-    __ast_mutable_fields__ = frozenset(('cardinality', 'multiplicity'))
+    __ast_mutable_fields__ = frozenset({'cardinality', 'multiplicity'})
 
     expr: Set
     """PathId for the __type__ link of object type arguments."""
@@ -827,7 +855,7 @@ class Stmt(Expr):
     # Parts of the edgeql->IR compiler need to create statements and fill in
     # the result later, but making it Optional would cause lots of errors,
     # so we stick a bogus Empty set in.
-    result: Set = EmptySet()  # type: ignore
+    result: Set = _PLACEHOLDER_SET
     parent_stmt: typing.Optional[Stmt] = None
     iterator_stmt: typing.Optional[Set] = None
     bindings: typing.Optional[typing.List[Set]] = None
@@ -859,7 +887,7 @@ class MutatingStmt(Stmt):
     # Parts of the edgeql->IR compiler need to create statements and fill in
     # the subject later, but making it Optional would cause lots of errors,
     # so we stick a bogus Empty set in.
-    subject: Set = EmptySet()  # type: ignore
+    subject: Set = _PLACEHOLDER_SET
     # Conflict checks that we should manually raise constraint violations
     # for.
     conflict_checks: typing.Optional[typing.List[OnConflictClause]] = None
@@ -240,10 +240,10 @@ def type_to_typeref(
         else:
             name = tname
 
-        descendants: Optional[FrozenSet[irast.TypeRef]]
+        descendants: Optional[Tuple[irast.TypeRef, ...]]
 
         if material_typeref is None and include_descendants:
-            descendants = frozenset(
+            descendants = tuple(
                 type_to_typeref(
                     schema,
                     child,
@@ -846,7 +846,8 @@ def find_actual_ptrref(
             return candidate
 
     for dp in ptrref.children:
-        if dp.dir_source(dir) and dp.dir_source(dir).id == source_typeref.id:
+        dp_source = dp.dir_source(dir)
+        if dp_source and dp_source.id == source_typeref.id:
             return dp
         else:
             candidate = maybe_find_actual_ptrref(
@@ -64,6 +64,7 @@ def _quote_ident(string):
     return '"' + string.replace('"', '""') + '"'
 
 
+@functools.lru_cache(maxsize=4096)
 def quote_ident(string, *, force=False):
     return _quote_ident(string) if needs_quoting(string) or force else string
 
@@ -342,6 +343,7 @@ def get_index_backend_name(id, module_name, catenate=True, *, aspect=None):
     return convert_name(name, aspect, catenate)
 
 
+@functools.lru_cache()
 def get_tuple_backend_name(id, catenate=True, *, aspect=None):
 
     name = s_name.QualName(module='edgedb', name=f'{id}_t')
@@ -19,9 +19,14 @@
 
 from __future__ import annotations
 
+from typing import *
+
+import functools
+
 from edb import errors
 from edb.ir import ast as irast
 
+from edb.edgeql import ast as qlast
 from edb.edgeql import qltypes
 
 from edb.pgsql import ast as pgast
@@ -35,7 +40,66 @@ from . import relctx
 from . import output
 
 
-@dispatch.compile.register
+# Constant leaf SQL nodes shared by all compiled config commands.
+# Only constants and type names with tuple names belong here: they
+# are immutable and hold no lists, so reusing them across queries is
+# safe.  Anything holding a list (column refs, arrays, function calls)
+# or a relation must be built per statement.
+_NULL = pgast.NullConstant()
+_FALSE = pgast.BooleanConstant(val='false')
+_TEXT_TYPE = pgast.TypeName(name=('text',))
+_JSONB_TYPE = pgast.TypeName(name=('jsonb',))
+_TEXT_ARRAY_TYPE = pgast.TypeName(name=('text[]',))
+_EMPTY_JSON_ARRAY_LITERAL = pgast.StringConstant(val='[]')
+_SET = pgast.StringConstant(val='SET')
+_RESET = pgast.StringConstant(val='RESET')
+_REM = pgast.StringConstant(val='REM')
+_ADD = pgast.StringConstant(val='ADD')
+_CONFIG_TYPE = pgast.StringConstant(val='C')
+_INSTANCE_SCOPE = pgast.StringConstant(
+    val=str(qltypes.ConfigScope.INSTANCE))
+
+# (schemaname, name) of the tables holding session and database
+# settings.  Relation nodes are mutable, so every statement gets its
+# own range var over these.
+_SESSION_STATE_TABLE = (None, '_edgecon_state')
+_DB_CONFIG_TABLE = ('edgedb', '_db_config')
+
+# The fixed parts of the session and database setting upserts:
+# (target relation, inserted columns, ON CONFLICT index columns).
+# Only the column names are kept here, the column lists themselves
+# are built afresh for every statement by _config_upsert().
+_SESSION_UPSERT = (
+    _SESSION_STATE_TABLE,
+    ('name', 'value', 'type'),
+    ('name', 'type'),
+)
+
+_DATABASE_UPSERT = (
+    _DB_CONFIG_TABLE,
+    ('name', 'value'),
+    ('name',),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _setting_name(name: str) -> pgast.StringConstant:
+    # Setting names come from a small fixed set, and StringConstant
+    # is immutable, so the literal nodes can be shared.
+    return pgast.StringConstant(val=name)
+
+
+def _table_rvar(table: Tuple[Optional[str], str]) -> pgast.RelRangeVar:
+    schemaname, name = table
+    return pgast.RelRangeVar(
+        relation=pgast.Relation(
+            name=name,
+            schemaname=schemaname,
+        ),
+    )
+
+
+@dispatch.register
 def compile_ConfigSet(
     op: irast.ConfigSet,
     *,
@@ -44,432 +108,487 @@ def compile_ConfigSet(
 
     val: pgast.BaseExpr
 
-    with ctx.new() as subctx:
-        if op.backend_setting:
-            output_format = context.OutputFormat.NATIVE
-        else:
-            output_format = context.OutputFormat.JSONB
-
-        with context.output_format(ctx, output_format):
-            if isinstance(op.expr, irast.EmptySet):
-                # Special handling for empty sets, because we want a
-                # singleton representation of the value and not an empty rel
-                # in this context.
-                if op.cardinality is qltypes.SchemaCardinality.One:
-                    val = pgast.NullConstant()
-                elif subctx.env.output_format is context.OutputFormat.JSONB:
-                    val = pgast.TypeCast(
-                        arg=pgast.StringConstant(val='[]'),
-                        type_name=pgast.TypeName(
-                            name=('jsonb',),
-                        ),
-                    )
-                else:
-                    val = pgast.TypeCast(
-                        arg=pgast.ArrayExpr(elements=[]),
-                        type_name=pgast.TypeName(
-                            name=('text[]',),
-                        ),
-                    )
+    if op.backend_setting:
+        output_format = context.OutputFormat.NATIVE
+    else:
+        output_format = context.OutputFormat.JSONB
+
+    with ctx.new() as subctx, context.output_format(ctx, output_format):
+        if isinstance(op.expr, irast.EmptySet):
+            # Special handling for empty sets, because we want a
+            # singleton representation of the value and not an empty rel
+            # in this context.
+            if op.cardinality is qltypes.SchemaCardinality.One:
+                val = _NULL
+            elif subctx.env.output_format is context.OutputFormat.JSONB:
+                val = pgast.TypeCast(
+                    arg=_EMPTY_JSON_ARRAY_LITERAL,
+                    type_name=_JSONB_TYPE,
+                )
             else:
-                val = dispatch.compile(op.expr, ctx=subctx)
-                assert isinstance(val, pgast.SelectStmt), "expected SelectStmt"
-
-                pathctx.get_path_serialized_output(
-                    val, op.expr.path_id, env=ctx.env)
-
-                if op.cardinality is qltypes.SchemaCardinality.Many:
-                    val = output.aggregate_json_output(
-                        val, op.expr, env=ctx.env)
-
-    result: pgast.BaseExpr
-
-    if op.scope is qltypes.ConfigScope.INSTANCE and op.backend_setting:
-        assert isinstance(val, pgast.SelectStmt) and len(val.target_list) == 1
-        valval = val.target_list[0].val
-        if isinstance(valval, pgast.TypeCast):
-            valval = valval.arg
-        if not isinstance(valval, pgast.BaseConstant):
-            raise AssertionError('value is not a constant in ConfigSet')
-        result = pgast.AlterSystem(
-            name=op.backend_setting,
-            value=valval,
-        )
+                val = pgast.TypeCast(
+                    arg=pgast.ArrayExpr(elements=[]),
+                    type_name=_TEXT_ARRAY_TYPE,
+                )
+        else:
+            val = dispatch.compile(op.expr, ctx=subctx)
+            assert isinstance(val, pgast.SelectStmt), "expected SelectStmt"
 
-    elif op.scope is qltypes.ConfigScope.DATABASE and op.backend_setting:
-        fcall = pgast.FuncCall(
-            name=('edgedb', '_alter_current_database_set'),
-            args=[pgast.StringConstant(val=op.backend_setting), val],
-        )
+            pathctx.get_path_serialized_output(
+                val, op.expr.path_id, env=ctx.env)
 
-        result = output.wrap_script_stmt(
-            pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
-            suppress_all_output=True,
-            env=ctx.env,
-        )
+            if op.cardinality is qltypes.SchemaCardinality.Many:
+                val = output.aggregate_json_output(
+                    val, op.expr, env=ctx.env)
 
-    elif op.scope is qltypes.ConfigScope.SESSION and op.backend_setting:
-        fcall = pgast.FuncCall(
-            name=('pg_catalog', 'set_config'),
-            args=[
-                pgast.StringConstant(val=op.backend_setting),
-                pgast.TypeCast(
-                    arg=val,
-                    type_name=pgast.TypeName(name=('text',)),
-                ),
-                pgast.BooleanConstant(val='false'),
-            ],
-        )
+    handler = _config_set_handlers.get(
+        (op.scope, bool(op.backend_setting)))
+    if handler is None:
+        raise AssertionError(f'unexpected configuration scope: {op.scope}')
 
-        result = output.wrap_script_stmt(
-            pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
-            suppress_all_output=True,
-            env=ctx.env,
-        )
+    return handler(op, val, ctx=ctx)
 
-    elif op.scope is qltypes.ConfigScope.INSTANCE:
-        result_row = pgast.RowExpr(
-            args=[
-                pgast.StringConstant(val='SET'),
-                pgast.StringConstant(val=str(op.scope)),
-                pgast.StringConstant(val=op.name),
-                val,
-            ]
-        )
 
-        result = pgast.FuncCall(
-            name=('jsonb_build_array',),
-            args=result_row.args,
-            null_safe=True,
-            ser_safe=True,
-        )
+def _set_instance_backend(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    assert isinstance(val, pgast.SelectStmt) and len(val.target_list) == 1
+    valval = val.target_list[0].val
+    if isinstance(valval, pgast.TypeCast):
+        valval = valval.arg
+    if not isinstance(valval, pgast.BaseConstant):
+        raise AssertionError('value is not a constant in ConfigSet')
+    return pgast.AlterSystem(
+        name=op.backend_setting,
+        value=valval,
+    )
 
-        result = pgast.SelectStmt(
-            target_list=[
-                pgast.ResTarget(
-                    val=result,
-                ),
-            ],
-        )
-    elif op.scope is qltypes.ConfigScope.SESSION:
-        result = pgast.InsertStmt(
-            relation=pgast.RelRangeVar(
-                relation=pgast.Relation(
-                    name='_edgecon_state',
-                ),
+
+def _set_database_backend(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    fcall = pgast.FuncCall(
+        name=('edgedb', '_alter_current_database_set'),
+        args=[_setting_name(op.backend_setting), val],
+    )
+
+    return output.wrap_script_stmt(
+        pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
+        suppress_all_output=True,
+        env=ctx.env,
+    )
+
+
+def _set_session_backend(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    fcall = pgast.FuncCall(
+        name=('pg_catalog', 'set_config'),
+        args=[
+            _setting_name(op.backend_setting),
+            pgast.TypeCast(
+                arg=val,
+                type_name=_TEXT_TYPE,
             ),
-            select_stmt=pgast.SelectStmt(
-                values=[
-                    pgast.ImplicitRowExpr(
-                        args=[
-                            pgast.StringConstant(
-                                val=op.name,
-                            ),
-                            val,
-                            pgast.StringConstant(
-                                val='C',
-                            ),
-                        ]
-                    )
-                ]
+            _FALSE,
+        ],
+    )
+
+    return output.wrap_script_stmt(
+        pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
+        suppress_all_output=True,
+        env=ctx.env,
+    )
+
+
+def _set_instance(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    result = pgast.FuncCall(
+        name=('jsonb_build_array',),
+        args=[
+            _SET,
+            _INSTANCE_SCOPE,
+            _setting_name(op.name),
+            val,
+        ],
+        null_safe=True,
+        ser_safe=True,
+    )
+
+    return pgast.SelectStmt(
+        target_list=[
+            pgast.ResTarget(
+                val=result,
             ),
-            cols=[
-                pgast.ColumnRef(name=['name']),
-                pgast.ColumnRef(name=['value']),
-                pgast.ColumnRef(name=['type']),
-            ],
-            on_conflict=pgast.OnConflictClause(
-                action='update',
-                infer=pgast.InferClause(
-                    index_elems=[
-                        pgast.ColumnRef(name=['name']),
-                        pgast.ColumnRef(name=['type']),
-                    ],
-                ),
-                target_list=[
-                    pgast.MultiAssignRef(
-                        columns=[pgast.ColumnRef(name=['value'])],
-                        source=pgast.RowExpr(
-                            args=[
-                                val,
-                            ],
-                        ),
-                    ),
+        ],
+    )
+
+
+def _set_session(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    return _config_upsert(
+        _SESSION_UPSERT,
+        [_setting_name(op.name), val, _CONFIG_TYPE],
+        val,
+    )
+
+
+def _set_database(
+    op: irast.ConfigSet,
+    val: pgast.BaseExpr,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    return _config_upsert(
+        _DATABASE_UPSERT,
+        [_setting_name(op.name), val],
+        val,
+    )
+
+
+def _config_upsert(
+    template: Tuple[
+        Tuple[Optional[str], str], Tuple[str, ...], Tuple[str, ...]],
+    row: List[pgast.BaseExpr],
+    val: pgast.BaseExpr,
+) -> pgast.InsertStmt:
+    table, cols, index_cols = template
+    return pgast.InsertStmt(
+        relation=_table_rvar(table),
+        select_stmt=pgast.SelectStmt(
+            values=[
+                pgast.ImplicitRowExpr(
+                    args=row,
+                )
+            ]
+        ),
+        cols=[pgast.ColumnRef(name=[col]) for col in cols],
+        on_conflict=pgast.OnConflictClause(
+            action='update',
+            infer=pgast.InferClause(
+                index_elems=[
+                    pgast.ColumnRef(name=[col]) for col in index_cols
                 ],
             ),
-        )
-    elif op.scope is qltypes.ConfigScope.DATABASE:
-        result = pgast.InsertStmt(
-            relation=pgast.RelRangeVar(
-                relation=pgast.Relation(
-                    name='_db_config',
-                    schemaname='edgedb',
-                ),
-            ),
-            select_stmt=pgast.SelectStmt(
-                values=[
-                    pgast.ImplicitRowExpr(
+            target_list=[
+                pgast.MultiAssignRef(
+                    columns=[pgast.ColumnRef(name=['value'])],
+                    source=pgast.RowExpr(
                         args=[
-                            pgast.StringConstant(
-                                val=op.name,
-                            ),
                             val,
-                        ]
-                    )
-                ]
-            ),
-            cols=[
-                pgast.ColumnRef(name=['name']),
-                pgast.ColumnRef(name=['value']),
-            ],
-            on_conflict=pgast.OnConflictClause(
-                action='update',
-                infer=pgast.InferClause(
-                    index_elems=[
-                        pgast.ColumnRef(name=['name']),
-                    ],
-                ),
-                target_list=[
-                    pgast.MultiAssignRef(
-                        columns=[pgast.ColumnRef(name=['value'])],
-                        source=pgast.RowExpr(
-                            args=[
-                                val,
-                            ],
-                        ),
+                        ],
                     ),
-                ],
-            ),
-        )
-    else:
-        raise AssertionError(f'unexpected configuration scope: {op.scope}')
+                ),
+            ],
+        ),
+    )
+
 
-    return result
+# (scope, is backend setting) -> handler
+_config_set_handlers: Dict[
+    Tuple[qltypes.ConfigScope, bool],
+    Callable[..., pgast.BaseExpr],
+] = {
+    (qltypes.ConfigScope.INSTANCE, True): _set_instance_backend,
+    (qltypes.ConfigScope.DATABASE, True): _set_database_backend,
+    (qltypes.ConfigScope.SESSION, True): _set_session_backend,
+    (qltypes.ConfigScope.INSTANCE, False): _set_instance,
+    (qltypes.ConfigScope.DATABASE, False): _set_database,
+    (qltypes.ConfigScope.SESSION, False): _set_session,
+}
 
 
-@dispatch.compile.register
+@dispatch.register
 def compile_ConfigReset(
     op: irast.ConfigReset,
     *,
     ctx: context.CompilerContextLevel,
 ) -> pgast.BaseExpr:
 
-    stmt: pgast.BaseExpr
+    handler = _config_reset_handlers.get(
+        (op.scope, bool(op.backend_setting)))
+    if handler is None:
+        raise AssertionError(f'unexpected configuration scope: {op.scope}')
 
-    if op.scope is qltypes.ConfigScope.INSTANCE and op.backend_setting:
-        stmt = pgast.AlterSystem(
-            name=op.backend_setting,
-            value=None,
-        )
+    return handler(op, ctx=ctx)
 
-    elif op.scope is qltypes.ConfigScope.DATABASE and op.backend_setting:
-        fcall = pgast.FuncCall(
-            name=('edgedb', '_alter_current_database_set'),
-            args=[
-                pgast.StringConstant(val=op.backend_setting),
-                pgast.NullConstant(),
-            ],
-        )
 
-        stmt = output.wrap_script_stmt(
-            pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
-            suppress_all_output=True,
-            env=ctx.env,
-        )
+def _reset_instance_backend(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    return pgast.AlterSystem(
+        name=op.backend_setting,
+        value=None,
+    )
 
-    elif op.scope is qltypes.ConfigScope.SESSION and op.backend_setting:
-        fcall = pgast.FuncCall(
-            name=('pg_catalog', 'set_config'),
-            args=[
-                pgast.StringConstant(val=op.backend_setting),
-                pgast.NullConstant(),
-                pgast.BooleanConstant(val='false'),
-            ],
-        )
 
-        stmt = output.wrap_script_stmt(
-            pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
-            suppress_all_output=True,
-            env=ctx.env,
-        )
+def _reset_database_backend(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    fcall = pgast.FuncCall(
+        name=('edgedb', '_alter_current_database_set'),
+        args=[
+            _setting_name(op.backend_setting),
+            _NULL,
+        ],
+    )
 
-    elif op.scope is qltypes.ConfigScope.INSTANCE:
-
-        if op.selector is None:
-            # Scalar reset
-            result_row = pgast.RowExpr(
-                args=[
-                    pgast.StringConstant(val='RESET'),
-                    pgast.StringConstant(val=str(op.scope)),
-                    pgast.StringConstant(val=op.name),
-                    pgast.NullConstant(),
-                ]
-            )
+    return output.wrap_script_stmt(
+        pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
+        suppress_all_output=True,
+        env=ctx.env,
+    )
 
-            rvar = None
-        else:
-            with context.output_format(ctx, context.OutputFormat.JSONB):
-                selector = dispatch.compile(op.selector, ctx=ctx)
-
-            assert isinstance(selector, pgast.SelectStmt), \
-                "expected ast.SelectStmt"
-            target = selector.target_list[0]
-            if not target.name:
-                target = selector.target_list[0] = pgast.ResTarget(
-                    name=ctx.env.aliases.get('res'),
-                    val=target.val,
-                )
-                assert target.name is not None
 
-            rvar = relctx.rvar_for_rel(selector, ctx=ctx)
+def _reset_session_backend(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    assert op.backend_setting
+    fcall = pgast.FuncCall(
+        name=('pg_catalog', 'set_config'),
+        args=[
+            _setting_name(op.backend_setting),
+            _NULL,
+            _FALSE,
+        ],
+    )
+
+    return output.wrap_script_stmt(
+        pgast.SelectStmt(target_list=[pgast.ResTarget(val=fcall)]),
+        suppress_all_output=True,
+        env=ctx.env,
+    )
 
-            result_row = pgast.RowExpr(
-                args=[
-                    pgast.StringConstant(val='REM'),
-                    pgast.StringConstant(val=str(op.scope)),
-                    pgast.StringConstant(val=op.name),
-                    astutils.get_column(rvar, target.name),
-                ]
+
+def _reset_instance(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    name_const = _setting_name(op.name)
+
+    args: List[pgast.BaseExpr]
+    if op.selector is None:
+        # Scalar reset
+        args = [
+            _RESET,
+            _INSTANCE_SCOPE,
+            name_const,
+            _NULL,
+        ]
+
+        rvar = None
+    else:
+        with context.output_format(ctx, context.OutputFormat.JSONB):
+            selector = dispatch.compile(op.selector, ctx=ctx)
+
+        assert isinstance(selector, pgast.SelectStmt), \
+            "expected ast.SelectStmt"
+        target = selector.target_list[0]
+        if not target.name:
+            target = selector.target_list[0] = pgast.ResTarget(
+                name=ctx.env.aliases.get('res'),
+                val=target.val,
             )
+            assert target.name is not None
+
+        rvar = relctx.rvar_for_rel(selector, ctx=ctx)
+
+        args = [
+            _REM,
+            _INSTANCE_SCOPE,
+            name_const,
+            astutils.get_column(rvar, target.name),
+        ]
+
+    result = pgast.FuncCall(
+        name=('jsonb_build_array',),
+        args=args,
+        null_safe=True,
+        ser_safe=True,
+    )
 
-        result = pgast.FuncCall(
-            name=('jsonb_build_array',),
-            args=result_row.args,
-            null_safe=True,
-            ser_safe=True,
-        )
+    stmt = pgast.SelectStmt(
+        target_list=[
+            pgast.ResTarget(
+                val=result,
+            ),
+        ],
+    )
 
-        stmt = pgast.SelectStmt(
-            target_list=[
-                pgast.ResTarget(
-                    val=result,
-                ),
-            ],
-        )
+    if rvar is not None:
+        stmt.from_clause = [rvar]
 
-        if rvar is not None:
-            stmt.from_clause = [rvar]
+    return stmt
 
-    elif op.scope is qltypes.ConfigScope.DATABASE:
-        stmt = pgast.DeleteStmt(
-            relation=pgast.RelRangeVar(
-                relation=pgast.Relation(
-                    name='_db_config',
-                    schemaname='edgedb',
-                ),
-            ),
 
-            where_clause=astutils.new_binop(
+def _reset_database(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    return pgast.DeleteStmt(
+        relation=_table_rvar(_DB_CONFIG_TABLE),
+
+        where_clause=astutils.new_binop(
+            lexpr=pgast.ColumnRef(name=['name']),
+            rexpr=_setting_name(op.name),
+            op='=',
+        ),
+    )
+
+
+def _reset_session(
+    op: irast.ConfigReset,
+    *,
+    ctx: context.CompilerContextLevel,
+) -> pgast.BaseExpr:
+    return pgast.DeleteStmt(
+        relation=_table_rvar(_SESSION_STATE_TABLE),
+
+        where_clause=astutils.new_binop(
+            lexpr=astutils.new_binop(
                 lexpr=pgast.ColumnRef(name=['name']),
-                rexpr=pgast.StringConstant(val=op.name),
+                rexpr=_setting_name(op.name),
                 op='=',
             ),
-        )
-
-    elif op.scope is qltypes.ConfigScope.SESSION:
-        stmt = pgast.DeleteStmt(
-            relation=pgast.RelRangeVar(
-                relation=pgast.Relation(
-                    name='_edgecon_state',
-                ),
+            rexpr=astutils.new_binop(
+                lexpr=pgast.ColumnRef(name=['type']),
+                rexpr=_CONFIG_TYPE,
+                op='=',
             ),
-
-            where_clause=astutils.new_binop(
-                lexpr=astutils.new_binop(
-                    lexpr=pgast.ColumnRef(name=['name']),
-                    rexpr=pgast.StringConstant(val=op.name),
-                    op='=',
-                ),
-                rexpr=astutils.new_binop(
-                    lexpr=pgast.ColumnRef(name=['type']),
-                    rexpr=pgast.StringConstant(val='C'),
-                    op='=',
-                ),
-                op='AND',
-            )
+            op='AND',
         )
+    )
 
-    else:
-        raise AssertionError(f'unexpected configuration scope: {op.scope}')
 
-    return stmt
+# (scope, is backend setting) -> handler
+_config_reset_handlers: Dict[
+    Tuple[qltypes.ConfigScope, bool],
+    Callable[..., pgast.BaseExpr],
+] = {
+    (qltypes.ConfigScope.INSTANCE, True): _reset_instance_backend,
+    (qltypes.ConfigScope.DATABASE, True): _reset_database_backend,
+    (qltypes.ConfigScope.SESSION, True): _reset_session_backend,
+    (qltypes.ConfigScope.INSTANCE, False): _reset_instance,
+    (qltypes.ConfigScope.DATABASE, False): _reset_database,
+    (qltypes.ConfigScope.SESSION, False): _reset_session,
+}
 
 
-@dispatch.compile.register
+@dispatch.register
 def compile_ConfigInsert(
         stmt: irast.ConfigInsert, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
 
-    with ctx.new() as subctx:
-        with context.output_format(ctx, context.OutputFormat.JSONB):
-            subctx.expr_exposed = True
-            rewritten = _rewrite_config_insert(stmt.expr, ctx=subctx)
-            dispatch.compile(rewritten, ctx=subctx)
-            clauses.fini_stmt(ctx.rel, ctx=subctx, parent_ctx=ctx)
+    with ctx.new() as subctx, (
+            context.output_format(ctx, context.OutputFormat.JSONB)):
+        subctx.expr_exposed = True
+        rewritten = _rewrite_config_insert(stmt.expr, ctx=subctx)
+        dispatch.compile(rewritten, ctx=subctx)
+        clauses.fini_stmt(ctx.rel, ctx=subctx, parent_ctx=ctx)
 
-            return pathctx.get_path_serialized_output(
-                ctx.rel, stmt.expr.path_id, env=ctx.env)
+        return pathctx.get_path_serialized_output(
+            ctx.rel, stmt.expr.path_id, env=ctx.env)
 
 
 def _rewrite_config_insert(
         ir_set: irast.Set, *,
         ctx: context.CompilerContextLevel) -> irast.Set:
 
-    overwrite_query = pgast.SelectStmt()
-    id_expr = pgast.FuncCall(
-        name=('edgedbext', 'uuid_generate_v1mc',),
-        args=[],
-    )
-    pathctx.put_path_identity_var(
-        overwrite_query, ir_set.path_id, id_expr, force=True, env=ctx.env)
-    pathctx.put_path_value_var(
-        overwrite_query, ir_set.path_id, id_expr, force=True, env=ctx.env)
-
-    relctx.add_type_rel_overlay(
-        ir_set.typeref,
-        'replace',
-        overwrite_query,
-        path_id=ir_set.path_id,
-        ctx=ctx,
-    )
+    # Nested config object inserts are processed with an explicit
+    # stack, in the same (pre-)order a recursive traversal would use.
+    stack = [ir_set]
+    while stack:
+        cur = stack.pop()
 
-    # Config objects have derived computed ids,
-    # so the autogenerated id must not be returned.
-    ir_set.shape = tuple(filter(
-        lambda el: (
-            (rptr := el[0].rptr) is not None
-            and rptr.ptrref.shortname.name != 'id'
-        ),
-        ir_set.shape,
-    ))
-
-    for el, _ in ir_set.shape:
-        if isinstance(el.expr, irast.InsertStmt):
-            el.shape = tuple(filter(
-                lambda e: (
-                    (rptr := e[0].rptr) is not None
-                    and rptr.ptrref.shortname.name != 'id'
-                ),
-                el.shape,
-            ))
+        overwrite_query = pgast.SelectStmt()
+        id_expr = pgast.FuncCall(
+            name=('edgedbext', 'uuid_generate_v1mc',),
+            args=[],
+        )
+        pathctx.put_path_identity_var(
+            overwrite_query, cur.path_id, id_expr, force=True, env=ctx.env)
+        pathctx.put_path_value_var(
+            overwrite_query, cur.path_id, id_expr, force=True, env=ctx.env)
+
+        relctx.add_type_rel_overlay(
+            cur.typeref,
+            'replace',
+            overwrite_query,
+            path_id=cur.path_id,
+            ctx=ctx,
+        )
 
-            result = _rewrite_config_insert(el.expr.subject, ctx=ctx)
-            el.expr = irast.SelectStmt(
-                result=result,
-                parent_stmt=el.expr.parent_stmt,
-            )
+        # Config objects have derived computed ids,
+        # so the autogenerated id must not be returned.
+        cur.shape = _strip_id_from_shape(cur.shape)
+
+        nested = []
+        for el, _ in cur.shape:
+            if isinstance(el.expr, irast.InsertStmt):
+                el.shape = _strip_id_from_shape(el.shape)
+
+                subject = el.expr.subject
+                el.expr = irast.SelectStmt(
+                    result=subject,
+                    parent_stmt=el.expr.parent_stmt,
+                )
+                nested.append(subject)
+
+        stack.extend(reversed(nested))
 
     return ir_set
 
 
+def _strip_id_from_shape(
+    shape: Tuple[Tuple[irast.Set, qlast.ShapeOp], ...],
+) -> Tuple[Tuple[irast.Set, qlast.ShapeOp], ...]:
+    result = []
+    for el in shape:
+        rptr = el[0].rptr
+        if rptr is not None and rptr.ptrref.shortname.name != 'id':
+            result.append(el)
+    return tuple(result)
+
+
 def top_output_as_config_op(
         ir_set: irast.Set,
         stmt: pgast.SelectStmt, *,
         env: context.Environment) -> pgast.Query:
 
-    assert isinstance(ir_set.expr, irast.ConfigCommand)
+    op = ir_set.expr
+    assert isinstance(op, irast.ConfigCommand)
 
-    if ir_set.expr.scope is qltypes.ConfigScope.INSTANCE:
+    if op.scope is qltypes.ConfigScope.INSTANCE:
         alias = env.aliases.get('cfg')
         subrvar = pgast.RangeSubselect(
             subquery=stmt,
@@ -487,18 +606,14 @@ def top_output_as_config_op(
             )
             assert stmt_res.name is not None
 
-        result_row = pgast.RowExpr(
-            args=[
-                pgast.StringConstant(val='ADD'),
-                pgast.StringConstant(val=str(ir_set.expr.scope)),
-                pgast.StringConstant(val=ir_set.expr.name),
-                pgast.ColumnRef(name=[stmt_res.name]),
-            ]
-        )
-
         array = pgast.FuncCall(
             name=('jsonb_build_array',),
-            args=result_row.args,
+            args=[
+                _ADD,
+                _INSTANCE_SCOPE,
+                _setting_name(op.name),
+                pgast.ColumnRef(name=[stmt_res.name]),
+            ],
             null_safe=True,
             ser_safe=True,
         )
@@ -521,4 +636,4 @@ def top_output_as_config_op(
         return result
     else:
         raise errors.InternalServerError(
-            f'CONFIGURE {ir_set.expr.scope} INSERT is not supported')
+            f'CONFIGURE {op.scope} INSERT is not supported')
@@ -23,7 +23,6 @@ from __future__ import annotations
 from typing import *
 
 import collections
-import contextlib
 import itertools
 import enum
 import uuid
@@ -415,14 +414,24 @@ class Environment:
 
 # XXX: this context hack is necessary until pathctx is converted
 #      to use context levels instead of using env directly.
-@contextlib.contextmanager
-def output_format(
-    ctx: CompilerContextLevel,
-    output_format: OutputFormat,
-) -> Generator[None, None, None]:
-    original_output_format = ctx.env.output_format
-    ctx.env.output_format = output_format
-    try:
-        yield
-    finally:
-        ctx.env.output_format = original_output_format
+class output_format:
+    # A plain class rather than a @contextlib.contextmanager generator,
+    # since this is entered around every config and clause compilation.
+
+    __slots__ = ('_env', '_output_format', '_original_output_format')
+
+    def __init__(
+        self,
+        ctx: CompilerContextLevel,
+        output_format: OutputFormat,
+    ) -> None:
+        self._env = ctx.env
+        self._output_format = output_format
+
+    def __enter__(self) -> None:
+        env = self._env
+        self._original_output_format = env.output_format
+        env.output_format = self._output_format
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._env.output_format = self._original_output_format
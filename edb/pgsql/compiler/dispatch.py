@@ -20,6 +20,7 @@
 from __future__ import annotations
 
 import functools
+from typing import *
 
 from edb.ir import ast as irast
 
@@ -28,14 +29,51 @@ from edb.pgsql import ast as pgast
 from . import context
 
 
+_CompileHandler = Callable[..., pgast.BaseExpr]
+
+
 @functools.singledispatch
-def compile(
+def _compile(
         ir: irast.Base, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
     raise NotImplementedError(
         f'no IR compiler handler for {ir.__class__}')
 
 
+# A type(ir) -> handler mapping, so that compile() does a single dict
+# lookup instead of going through the singledispatch wrapper.  Filled
+# lazily from the singledispatch registry.
+_compile_handlers: Dict[type, _CompileHandler] = {}
+
+
+def register(
+    cls: Any,
+    func: Optional[_CompileHandler] = None,
+) -> Any:
+    """Register a compile() handler for the given IR node class."""
+    if func is None and isinstance(cls, type):
+        # Decorator form: @register(irast.Foo)
+        return lambda f: register(cls, f)
+
+    result = _compile.register(cls, func)
+    # Drop memoized lookups only once the new handler is in the
+    # registry, as it may shadow a handler cached for a subclass.
+    _compile_handlers.clear()
+    return result
+
+
+def compile(
+        ir: irast.Base, *,
+        ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
+    ir_cls = type(ir)
+    handler = _compile_handlers.get(ir_cls)
+    if handler is None:
+        handler = _compile.dispatch(ir_cls)
+        _compile_handlers[ir_cls] = handler
+
+    return handler(ir, ctx=ctx)
+
+
 @functools.singledispatch
 def visit(
         ir: irast.Base, *,
@@ -47,7 +47,7 @@ from . import relgen
 from . import shapecomp
 
 
-@dispatch.compile.register(irast.Set)
+@dispatch.register(irast.Set)
 def compile_Set(
         ir_set: irast.Set, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -114,7 +114,7 @@ def _compile_set_impl(
         _compile_set(ir_set, ctx=ctx)
 
 
-@dispatch.compile.register(irast.Parameter)
+@dispatch.register(irast.Parameter)
 def compile_Parameter(
         expr: irast.Parameter, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -154,7 +154,7 @@ def compile_Parameter(
     )
 
 
-@dispatch.compile.register(irast.StringConstant)
+@dispatch.register(irast.StringConstant)
 def compile_StringConstant(
         expr: irast.StringConstant, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -167,7 +167,7 @@ def compile_StringConstant(
     )
 
 
-@dispatch.compile.register(irast.BytesConstant)
+@dispatch.register(irast.BytesConstant)
 def compile_BytesConstant(
         expr: irast.StringConstant, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -175,10 +175,10 @@ def compile_BytesConstant(
     return pgast.ByteaConstant(val=expr.value)
 
 
-@dispatch.compile.register(irast.FloatConstant)
-@dispatch.compile.register(irast.DecimalConstant)
-@dispatch.compile.register(irast.BigintConstant)
-@dispatch.compile.register(irast.IntegerConstant)
+@dispatch.register(irast.FloatConstant)
+@dispatch.register(irast.DecimalConstant)
+@dispatch.register(irast.BigintConstant)
+@dispatch.register(irast.IntegerConstant)
 def compile_FloatConstant(
         expr: irast.BaseConstant, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -191,7 +191,7 @@ def compile_FloatConstant(
     )
 
 
-@dispatch.compile.register(irast.BooleanConstant)
+@dispatch.register(irast.BooleanConstant)
 def compile_BooleanConstant(
         expr: irast.BooleanConstant, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -204,7 +204,7 @@ def compile_BooleanConstant(
     )
 
 
-@dispatch.compile.register(irast.TypeCast)
+@dispatch.register(irast.TypeCast)
 def compile_TypeCast(
         expr: irast.TypeCast, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -257,7 +257,7 @@ def compile_TypeCast(
     return res
 
 
-@dispatch.compile.register(irast.IndexIndirection)
+@dispatch.register(irast.IndexIndirection)
 def compile_IndexIndirection(
         expr: irast.IndexIndirection, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -287,7 +287,7 @@ def compile_IndexIndirection(
     return result
 
 
-@dispatch.compile.register(irast.SliceIndirection)
+@dispatch.register(irast.SliceIndirection)
 def compile_SliceIndirection(
         expr: irast.SliceIndirection, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -315,7 +315,7 @@ def compile_SliceIndirection(
     return result
 
 
-@dispatch.compile.register(irast.OperatorCall)
+@dispatch.register(irast.OperatorCall)
 def compile_OperatorCall(
         expr: irast.OperatorCall, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -480,7 +480,7 @@ def _cast_operands(
     return lexpr, rexpr
 
 
-@dispatch.compile.register(irast.TypeCheckOp)
+@dispatch.register(irast.TypeCheckOp)
 def compile_TypeCheckOp(
         expr: irast.TypeCheckOp, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -518,7 +518,7 @@ def compile_TypeCheckOp(
     return result
 
 
-@dispatch.compile.register(irast.Array)
+@dispatch.register(irast.Array)
 def compile_Array(
         expr: irast.Array, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -526,7 +526,7 @@ def compile_Array(
     return relgen.build_array_expr(expr, elements, ctx=ctx)
 
 
-@dispatch.compile.register(irast.Tuple)
+@dispatch.register(irast.Tuple)
 def compile_Tuple(
         expr: irast.Tuple, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -553,7 +553,7 @@ def compile_Tuple(
     return output.output_as_value(result, env=ctx.env)
 
 
-@dispatch.compile.register(irast.TypeRef)
+@dispatch.register(irast.TypeRef)
 def compile_TypeRef(
         expr: irast.TypeRef, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -570,7 +570,7 @@ def compile_TypeRef(
     return result
 
 
-@dispatch.compile.register(irast.FunctionCall)
+@dispatch.register(irast.FunctionCall)
 def compile_FunctionCall(
         expr: irast.FunctionCall, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
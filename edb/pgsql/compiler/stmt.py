@@ -34,7 +34,7 @@ from . import dml
 from . import pathctx
 
 
-@dispatch.compile.register(irast.SelectStmt)
+@dispatch.register(irast.SelectStmt)
 def compile_SelectStmt(
         stmt: irast.SelectStmt, *,
         ctx: context.CompilerContextLevel) -> pgast.BaseExpr:
@@ -142,7 +142,7 @@ def compile_SelectStmt(
     return query
 
 
-@dispatch.compile.register(irast.InsertStmt)
+@dispatch.register(irast.InsertStmt)
 def compile_InsertStmt(
         stmt: irast.InsertStmt, *,
         ctx: context.CompilerContextLevel) -> pgast.Query:
@@ -170,7 +170,7 @@ def compile_InsertStmt(
             stmt, ctx.rel, parts, parent_ctx=parent_ctx, ctx=ctx)
 
 
-@dispatch.compile.register(irast.UpdateStmt)
+@dispatch.register(irast.UpdateStmt)
 def compile_UpdateStmt(
         stmt: irast.UpdateStmt, *,
         ctx: context.CompilerContextLevel) -> pgast.Query:
@@ -199,7 +199,7 @@ def compile_UpdateStmt(
             stmt, ctx.rel, parts, parent_ctx=parent_ctx, ctx=ctx)
 
 
-@dispatch.compile.register(irast.DeleteStmt)
+@dispatch.register(irast.DeleteStmt)
 def compile_DeleteStmt(
         stmt: irast.DeleteStmt, *,
         ctx: context.CompilerContextLevel) -> pgast.Query:
@@ -60,60 +60,66 @@ class Role(base.DBObject):
         return qi(self.name)
 
 
+_role_exists_query = textwrap.dedent('''\
+    SELECT
+        rolname
+    FROM
+        pg_catalog.pg_roles
+    WHERE
+        rolname = {name}
+''')
+
+
 class RoleExists(base.Condition):
     def __init__(self, name):
         self.name = name
 
     def code(self, block: base.PLBlock) -> str:
-        return textwrap.dedent(f'''\
-            SELECT
-                rolname
-            FROM
-                pg_catalog.pg_roles
-            WHERE
-                rolname = {ql(self.name)}
-        ''')
+        return _role_exists_query.format(name=ql(self.name))
 
 
 class RoleCommand:
 
     def _render(self):
+        obj = self.object
         attrs = []
 
-        attrmap = {
-            'superuser': 'SUPERUSER',
-            'allow_login': 'LOGIN',
-            'allow_createdb': 'CREATEDB',
-            'allow_createrole': 'CREATEROLE',
-        }
-
-        for objattr, stmtattr in attrmap.items():
-            attr = getattr(self.object, objattr)
-            if attr is base.NotSpecified:
-                continue
-            elif attr:
-                attrs.append(stmtattr)
-            else:
-                attrs.append(f'NO{stmtattr}')
-
-        if self.object.password is None:
+        superuser = obj.superuser
+        if superuser is not base.NotSpecified:
+            attrs.append('SUPERUSER' if superuser else 'NOSUPERUSER')
+
+        allow_login = obj.allow_login
+        if allow_login is not base.NotSpecified:
+            attrs.append('LOGIN' if allow_login else 'NOLOGIN')
+
+        allow_createdb = obj.allow_createdb
+        if allow_createdb is not base.NotSpecified:
+            attrs.append('CREATEDB' if allow_createdb else 'NOCREATEDB')
+
+        allow_createrole = obj.allow_createrole
+        if allow_createrole is not base.NotSpecified:
+            attrs.append(
+                'CREATEROLE' if allow_createrole else 'NOCREATEROLE')
+
+        password = obj.password
+        if password is None:
             attrs.append('PASSWORD NULL')
-        elif self.object.password is not base.NotSpecified:
-            attrs.append(f'PASSWORD {ql(self.object.password)}')
+        elif password is not base.NotSpecified:
+            attrs.append(f'PASSWORD {ql(password)}')
 
-        return f'ROLE {self.object.get_id()} {" ".join(attrs)}'
+        return f'ROLE {obj.get_id()} {" ".join(attrs)}'
 
 
 class CreateRole(ddl.CreateObject, RoleCommand):
 
     def code(self, block: base.PLBlock) -> str:
         if self.object.membership:
-            roles = ', '.join(qi(str(m)) for m in self.object.membership)
+            roles = ', '.join([qi(m) for m in self.object.membership])
             membership = f'IN ROLE {roles}'
         else:
             membership = ''
         if self.object.members:
-            roles = ', '.join(qi(str(m)) for m in self.object.members)
+            roles = ', '.join([qi(m) for m in self.object.members])
             members = f'ROLE {roles}'
         else:
             members = ''
@@ -165,5 +171,5 @@ class AlterRoleAddMembership(ddl.SchemaObjectOperation):
         self.membership = membership
 
     def code(self, block: base.PLBlock) -> str:
-        roles = ', '.join(qi(m) for m in self.membership)
+        roles = ', '.join([qi(m) for m in self.membership])
         return f'GRANT {roles} TO {qi(self.name)}'
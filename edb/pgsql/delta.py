@@ -23,8 +23,11 @@ from __future__ import annotations
 from typing import *
 
 import collections.abc
+import functools
 import itertools
 import textwrap
+import uuid
+import weakref
 
 from edb import errors
 
@@ -87,7 +90,28 @@ if TYPE_CHECKING:
     from edb.schema import schema as s_schema
 
 
+# Schemas are immutable, so has_table() results can be memoized
+# per schema instance for as long as that schema is alive.
+_has_table_cache: weakref.WeakKeyDictionary[
+    s_schema.Schema, Dict[uuid.UUID, bool]
+] = weakref.WeakKeyDictionary()
+
+
 def has_table(obj, schema):
+    try:
+        schema_cache = _has_table_cache[schema]
+    except KeyError:
+        schema_cache = _has_table_cache[schema] = {}
+
+    obj_id = obj.id
+    result = schema_cache.get(obj_id)
+    if result is None:
+        result = schema_cache[obj_id] = _has_table(obj, schema)
+
+    return result
+
+
+def _has_table(obj, schema):
     if isinstance(obj, s_objtypes.ObjectType):
         return not (
             obj.is_compound_type(schema) or
@@ -115,6 +139,13 @@ def has_table(obj, schema):
         )
 
 
+@functools.lru_cache()
+def _get_default_backend_params() -> pgcluster.BackendRuntimeParams:
+    # Computing the defaults probes the C.UTF-8 locale, and the
+    # result is an immutable NamedTuple, so compute it only once.
+    return pgcluster.get_default_runtime_params()
+
+
 class CommandMeta(sd.CommandMeta):
     pass
 
@@ -130,9 +161,10 @@ class MetaCommand(sd.Command, metaclass=CommandMeta):
         context: sd.CommandContext,
     ) -> s_schema.Schema:
         schema = super().apply_prerequisites(schema, context)
-        for op in self.get_prerequisites():
-            if not isinstance(op, sd.AlterObjectProperty):
-                self.pgops.add(op)
+        self.pgops.update(
+            op for op in self.get_prerequisites()
+            if not isinstance(op, sd.AlterObjectProperty)
+        )
         return schema
 
     def apply_subcommands(
@@ -141,12 +173,13 @@ class MetaCommand(sd.Command, metaclass=CommandMeta):
         context: sd.CommandContext,
     ) -> s_schema.Schema:
         schema = super().apply_subcommands(schema, context)
-        for op in self.get_subcommands(
-            include_prerequisites=False,
-            include_caused=False,
-        ):
-            if not isinstance(op, sd.AlterObjectProperty):
-                self.pgops.add(op)
+        self.pgops.update(
+            op for op in self.get_subcommands(
+                include_prerequisites=False,
+                include_caused=False,
+            )
+            if not isinstance(op, sd.AlterObjectProperty)
+        )
         return schema
 
     def apply_caused(
@@ -155,9 +188,10 @@ class MetaCommand(sd.Command, metaclass=CommandMeta):
         context: sd.CommandContext,
     ) -> s_schema.Schema:
         schema = super().apply_caused(schema, context)
-        for op in self.get_caused():
-            if not isinstance(op, sd.AlterObjectProperty):
-                self.pgops.add(op)
+        self.pgops.update(
+            op for op in self.get_caused()
+            if not isinstance(op, sd.AlterObjectProperty)
+        )
         return schema
 
     def generate(self, block: dbops.PLBlock) -> None:
@@ -194,7 +228,7 @@ class MetaCommand(sd.Command, metaclass=CommandMeta):
             backend_params = cast(
                 pgcluster.BackendRuntimeParams, ctx_backend_params)
         else:
-            backend_params = pgcluster.get_default_runtime_params()
+            backend_params = _get_default_backend_params()
 
         return backend_params
 
@@ -363,14 +397,7 @@ class AlterGlobalSchemaVersion(
         ver_id = str(self.scls.id)
         ver_name = str(self.scls.get_name(schema))
 
-        ctx_backend_params = context.backend_runtime_params
-        if ctx_backend_params is not None:
-            backend_params = cast(
-                pgcluster.BackendRuntimeParams, ctx_backend_params)
-        else:
-            backend_params = pgcluster.get_default_runtime_params()
-
-        instance_params = backend_params.instance_params
+        instance_params = self._get_instance_params(context)
         capabilities = instance_params.capabilities
         tenant_id = instance_params.tenant_id
 
@@ -697,14 +724,20 @@ class AlterParameter(
     pass
 
 
+_rval_type_test_query = textwrap.dedent('''\
+    (SELECT
+        pg_typeof(f.i)
+    FROM
+        (SELECT NULL::text) AS spreader
+        LEFT JOIN (SELECT {expr} WHERE False) AS f(i) ON (true))''')
+
+
 class FunctionCommand(MetaCommand):
     def get_pgname(self, func: s_funcs.Function, schema):
         return common.get_backend_name(schema, func, catenate=False)
 
     def get_pgtype(self, func: s_funcs.Function, obj, schema):
-        if obj.is_any(schema):
-            return ('anyelement',)
-
+        # pg_type_from_object() maps anytype to anyelement itself.
         try:
             return types.pg_type_from_object(
                 schema, obj, persistent_tuples=True)
@@ -737,8 +770,15 @@ class FunctionCommand(MetaCommand):
                 f'of function {func.get_shortname(schema)}: {ex}',
                 context=self.source_context) from ex
 
-    def compile_args(self, func: s_funcs.Function, schema):
-        func_params = func.get_params(schema)
+    def compile_args(
+        self,
+        func: s_funcs.Function,
+        schema,
+        *,
+        func_params: Optional[s_funcs.FuncParameterList] = None,
+    ):
+        if func_params is None:
+            func_params = func.get_params(schema)
         has_inlined_defaults = func.has_inlined_defaults(schema)
 
         args = []
@@ -751,13 +791,14 @@ class FunctionCommand(MetaCommand):
 
         for param in func_params.get_in_canonical_order(schema):
             param_type = param.get_type(schema)
-            param_default = param.get_default(schema)
-
             pg_at = self.get_pgtype(func, param_type, schema)
 
             default = None
-            if compile_defaults and param_default is not None:
-                default = self.compile_default(func, param_default, schema)
+            if compile_defaults:
+                param_default = param.get_default(schema)
+                if param_default is not None:
+                    default = self.compile_default(
+                        func, param_default, schema)
 
             pn = param.get_parameter_name(schema)
             args.append((pn, pg_at, default))
@@ -772,7 +813,7 @@ class FunctionCommand(MetaCommand):
         func_params = func.get_params(schema)
         return dbops.Function(
             name=self.get_pgname(func, schema),
-            args=self.compile_args(func, schema),
+            args=self.compile_args(func, schema, func_params=func_params),
             has_variadic=func_params.find_variadic(schema) is not None,
             set_returning=func_return_typemod is ql_ft.TypeModifier.SetOfType,
             volatility=func.get_volatility(schema),
@@ -864,8 +905,11 @@ class FunctionCommand(MetaCommand):
         set_returning = func_return_typemod is ql_ft.TypeModifier.SetOfType
         my_params = func.get_params(schema).objects(schema)
         param_name = my_params[ov_param_idx].get_parameter_name(schema)
-        type_param_name = f'__{param_name}__type'
-        cases = {}
+        type_param = qi(f'__{param_name}__type')
+        # Object-overloaded functions differ only in the overloaded
+        # parameter type, so each type appears at most once here.
+        cases = []
+        impl_ids = []
         all_overloads = list(overloads)
         if not isinstance(self, DeleteFunction):
             all_overloads.append(func)
@@ -874,22 +918,23 @@ class FunctionCommand(MetaCommand):
             ov_p_t = ov_p[ov_param_idx].get_type(schema)
             ov_body = self.compile_edgeql_function_body(
                 overload, schema, context)
+            ov_t_id = ql(str(ov_p_t.id))
 
             if set_returning:
                 case = (
                     f"(SELECT * FROM ({ov_body}) AS q "
-                    f"WHERE ancestor = {ql(str(ov_p_t.id))})"
+                    f"WHERE ancestor = {ov_t_id})"
                 )
             else:
                 case = (
-                    f"WHEN ancestor = {ql(str(ov_p_t.id))} "
+                    f"WHEN ancestor = {ov_t_id} "
                     f"THEN \n({ov_body})"
                 )
 
-            cases[ov_p_t] = case
+            cases.append(case)
+            impl_ids.append(f'{ov_t_id}::uuid')
 
-        impl_ids = ', '.join(f'{ql(str(t.id))}::uuid' for t in cases)
-        branches = list(cases.values())
+        impl_id_list = ', '.join(impl_ids)
 
         # N.B: edgedb.raise and coalesce are used below instead of
         #      raise_on_null, because the latter somehow results in a
@@ -901,7 +946,7 @@ class FunctionCommand(MetaCommand):
                         ancestor
                     FROM
                         (SELECT
-                            {qi(type_param_name)} AS ancestor,
+                            {type_param} AS ancestor,
                             -1 AS index
                         UNION ALL
                         SELECT
@@ -909,9 +954,9 @@ class FunctionCommand(MetaCommand):
                             index
                         FROM
                             edgedb."_SchemaObjectType__ancestors"
-                            WHERE source = {qi(type_param_name)}
+                            WHERE source = {type_param}
                         ) a
-                    WHERE ancestor IN ({impl_ids})
+                    WHERE ancestor IN ({impl_id_list})
                     ORDER BY index
                     LIMIT 1
                 ),
@@ -921,14 +966,14 @@ class FunctionCommand(MetaCommand):
                     'assert_failure',
                     msg => format(
                         'unhandled object type %s in overloaded function',
-                        {qi(type_param_name)}
+                        {type_param}
                     )
                 )
             ) AS impl(ancestor)
         """
 
         if set_returning:
-            arms = "\nUNION ALL\n".join(branches)
+            arms = "\nUNION ALL\n".join(cases)
             return f"""
                 SELECT
                     q.*
@@ -939,7 +984,7 @@ class FunctionCommand(MetaCommand):
                     ) AS q
             """
         else:
-            arms = "\n".join(branches)
+            arms = "\n".join(cases)
             return f"""
                 SELECT
                     (CASE {arms} END)
@@ -1001,12 +1046,7 @@ class FunctionCommand(MetaCommand):
         # weird looking query below, where we rely in Postgres executor to
         # skip the call, because no rows satisfy the WHERE condition, but
         # we then still generate a NULL row via a LEFT JOIN.
-        f_test = textwrap.dedent(f'''\
-            (SELECT
-                pg_typeof(f.i)
-            FROM
-                (SELECT NULL::text) AS spreader
-                LEFT JOIN (SELECT {expr} WHERE False) AS f(i) ON (true))''')
+        f_test = _rval_type_test_query.format(expr=expr)
 
         check = dbops.Query(text=f'''
             PERFORM
@@ -1038,13 +1078,17 @@ class FunctionCommand(MetaCommand):
         cobj: s_funcs.CallableObject,
         sql_func: str,
         schema: s_schema.Schema,
+        *,
+        arg_types: Optional[Iterable[Tuple[str, ...]]] = None,
     ) -> str:
-        args = []
-        func_params = cobj.get_params(schema)
-        for param in func_params.get_in_canonical_order(schema):
-            param_type = param.get_type(schema)
-            pg_at = self.get_pgtype(cobj, param_type, schema)
-            args.append(f'NULL::{qt(pg_at)}')
+        if arg_types is None:
+            func_params = cobj.get_params(schema)
+            arg_types = [
+                self.get_pgtype(cobj, param.get_type(schema), schema)
+                for param in func_params.get_in_canonical_order(schema)
+            ]
+
+        args = [f'NULL::{qt(pg_at)}' for pg_at in arg_types]
 
         return f'{sql_func}({", ".join(args)})'
 
@@ -1060,12 +1104,12 @@ class FunctionCommand(MetaCommand):
             # Intrinsic function, handled directly by the compiler.
             return ()
         elif sql_func := func.get_from_function(schema):
-            func_params = func.get_params(schema)
-
+            # Check the plain flags before the more expensive
+            # polymorphism scan of the parameters.
             if (
                 func.get_force_return_cast(schema)
-                or func_params.has_polymorphic(schema)
                 or func.get_sql_func_has_out_params(schema)
+                or func.get_params(schema).has_polymorphic(schema)
             ):
                 return ()
             else:
@@ -1167,6 +1211,22 @@ class DeleteFunction(FunctionCommand, adapts=s_funcs.DeleteFunction):
         return super().apply(schema, context)
 
 
+# Operand expressions of operator calls, by operator kind.  Operand
+# types are looked up by index in the (left, right) args pair, so only
+# the operands the kind actually has are touched.
+_proxy_op_templates = {
+    ql_ft.OperatorKind.Infix: '$1::{args[0]} {op} $2::{args[1]}',
+    ql_ft.OperatorKind.Postfix: '$1::{args[0]} {op}',
+    ql_ft.OperatorKind.Prefix: '{op} $1::{args[1]}',
+}
+
+_dummy_op_templates = {
+    ql_ft.OperatorKind.Infix: 'NULL::{args[0]} {op} NULL::{args[1]}',
+    ql_ft.OperatorKind.Postfix: 'NULL::{args[0]} {op}',
+    ql_ft.OperatorKind.Prefix: '{op} NULL::{args[1]}',
+}
+
+
 class OperatorCommand(FunctionCommand):
 
     def oper_name_to_pg_name(
@@ -1224,6 +1284,20 @@ class OperatorCommand(FunctionCommand):
                 oper, oper.get_return_type(schema), schema),
             text=oper.get_code(schema))
 
+    def get_proxy_operator_expr(
+        self,
+        oper: s_opers.Operator,
+        pgop: str,
+        from_args: Tuple[Tuple[str, ...], ...],
+        schema: s_schema.Schema,
+    ) -> str:
+        oper_kind = oper.get_operator_kind(schema)
+        template = _proxy_op_templates.get(oper_kind)
+        if template is None:
+            raise RuntimeError(f'unexpected operator kind: {oper_kind!r}')
+
+        return template.format(op=pgop, args=from_args)
+
     def get_dummy_operator_call(
         self,
         oper: s_opers.Operator,
@@ -1233,17 +1307,12 @@ class OperatorCommand(FunctionCommand):
     ) -> str:
         # Need a proxy function with casts
         oper_kind = oper.get_operator_kind(schema)
-
-        if oper_kind is ql_ft.OperatorKind.Infix:
-            op = f'NULL::{qt(from_args[0])} {pgop} NULL::{qt(from_args[1])}'
-        elif oper_kind is ql_ft.OperatorKind.Postfix:
-            op = f'NULL::{qt(from_args[0])} {pgop}'
-        elif oper_kind is ql_ft.OperatorKind.Prefix:
-            op = f'{pgop} NULL::{qt(from_args[1])}'
-        else:
+        template = _dummy_op_templates.get(oper_kind)
+        if template is None:
             raise RuntimeError(f'unexpected operator kind: {oper_kind!r}')
 
-        return op
+        return template.format(
+            op=pgop, args=[a and qt(a) for a in from_args])
 
 
 class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
@@ -1282,10 +1351,16 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
             else:
                 from_args = args
 
+            # Parameter types of oper_func when it was compiled from
+            # the operator's own signature and can be reused for the
+            # consistency check below.
+            oper_func_arg_types = None
+
             if oper_code:
                 oper_func = self.make_operator_function(oper, schema)
                 self.pgops.add(dbops.CreateFunction(oper_func))
                 oper_func_name = common.qname(*oper_func.name)
+                oper_func_arg_types = [t for _, t in oper_func.args]
 
             elif oper_fromfunc:
                 oper_func_name = oper_fromfunc[0]
@@ -1294,18 +1369,8 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
 
             elif from_args != args:
                 # Need a proxy function with casts
-                oper_kind = oper.get_operator_kind(schema)
-
-                if oper_kind is ql_ft.OperatorKind.Infix:
-                    op = (f'$1::{from_args[0]} {pg_oper_name} '
-                          f'$2::{from_args[1]}')
-                elif oper_kind is ql_ft.OperatorKind.Postfix:
-                    op = f'$1::{from_args[0]} {pg_oper_name}'
-                elif oper_kind is ql_ft.OperatorKind.Prefix:
-                    op = f'{pg_oper_name} $1::{from_args[1]}'
-                else:
-                    raise RuntimeError(
-                        f'unexpected operator kind: {oper_kind!r}')
+                op = self.get_proxy_operator_expr(
+                    oper, pg_oper_name, from_args, schema)
 
                 rtype = self.get_pgtype(
                     oper, oper.get_return_type(schema), schema)
@@ -1325,16 +1390,20 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
             else:
                 oper_func_name = None
 
+            oper_backend_name = common.get_backend_name(
+                schema, oper, catenate=False)
+            polymorphic = params.has_polymorphic(schema)
+
             if (
                 pg_oper_name is not None
-                and not params.has_polymorphic(schema)
+                and not polymorphic
                 or all(
                     p.get_type(schema).is_array()
                     for p in params.objects(schema)
                 )
             ):
                 self.pgops.add(dbops.CreateOperatorAlias(
-                    name=common.get_backend_name(schema, oper, catenate=False),
+                    name=oper_backend_name,
                     args=args,
                     procedure=oper_func_name,
                     base_operator=('pg_catalog', pg_oper_name),
@@ -1343,10 +1412,11 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
                     negator=negator,
                 ))
 
-                if not params.has_polymorphic(schema):
+                if not polymorphic:
                     if oper_func_name is not None:
                         cexpr = self.get_dummy_func_call(
-                            oper, oper_func_name, schema)
+                            oper, oper_func_name, schema,
+                            arg_types=oper_func_arg_types)
                     else:
                         cexpr = self.get_dummy_operator_call(
                             oper, pg_oper_name, from_args, schema)
@@ -1356,7 +1426,7 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
                     self.pgops.add(check)
             elif oper_func_name is not None:
                 self.pgops.add(dbops.CreateOperator(
-                    name=common.get_backend_name(schema, oper, catenate=False),
+                    name=oper_backend_name,
                     args=from_args,
                     procedure=oper_func_name,
                 ))
@@ -1375,7 +1445,8 @@ class CreateOperator(OperatorCommand, adapts=s_opers.CreateOperator):
 
             if not params.has_polymorphic(schema):
                 cexpr = self.get_dummy_func_call(
-                    oper, q(*oper_func.name), schema)
+                    oper, q(*oper_func.name), schema,
+                    arg_types=[t for _, t in oper_func.args])
                 check = self.sql_rval_consistency_check(oper, cexpr, schema)
                 self.pgops.add(check)
 
@@ -1688,10 +1759,10 @@ class AlterConstraint(
         constraint = self.scls
         if self.metadata_only:
             return schema
-        if (
-            not self.constraint_is_effective(schema, constraint)
-            and not self.constraint_is_effective(orig_schema, constraint)
-        ):
+
+        effective = self.constraint_is_effective(schema, constraint)
+        orig_effective = self.constraint_is_effective(orig_schema, constraint)
+        if not effective and not orig_effective:
             return schema
 
         subject = constraint.get_subject(schema)
@@ -1720,28 +1791,14 @@ class AlterConstraint(
             )
 
             op = dbops.CommandGroup()
-            if not self.constraint_is_effective(orig_schema, constraint):
+            if not orig_effective:
                 op.add_command(bconstr.create_ops())
-
-                for child in constraint.children(schema):
-                    orig_cbconstr = schemac_to_backendc(
-                        child.get_subject(orig_schema),
-                        child,
-                        orig_schema,
-                        context,
-                        self.source_context,
-                    )
-                    cbconstr = schemac_to_backendc(
-                        child.get_subject(schema),
-                        child,
-                        schema,
-                        context,
-                        self.source_context,
-                    )
-                    op.add_command(cbconstr.alter_ops(orig_cbconstr))
-            elif not self.constraint_is_effective(schema, constraint):
+            else:
                 op.add_command(bconstr.alter_ops(orig_bconstr))
 
+            if not orig_effective or not effective:
+                # The constraint changed effectiveness, so the backend
+                # constraints of its children need to follow suit.
                 for child in constraint.children(schema):
                     orig_cbconstr = schemac_to_backendc(
                         child.get_subject(orig_schema),
@@ -1758,8 +1815,7 @@ class AlterConstraint(
                         self.source_context,
                     )
                     op.add_command(cbconstr.alter_ops(orig_cbconstr))
-            else:
-                op.add_command(bconstr.alter_ops(orig_bconstr))
+
             self.pgops.add(op)
 
         return schema
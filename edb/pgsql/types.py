@@ -22,6 +22,8 @@
 from __future__ import annotations
 
 import functools
+import uuid
+import weakref
 from typing import *
 
 from edb.ir import ast as irast
@@ -160,11 +162,37 @@ def pg_type_array(tp: Tuple[str, ...]) -> Tuple[str, ...]:
         return (tp[0], tp[1] + '[]')
 
 
+# Memoized pg_type_from_object() results for each (immutable) schema.
+_pg_type_cache: weakref.WeakKeyDictionary[
+    s_schema.Schema,
+    Dict[Tuple[uuid.UUID, bool], Tuple[str, ...]],
+] = weakref.WeakKeyDictionary()
+
+
 def pg_type_from_object(
         schema: s_schema.Schema,
         obj: s_obj.Object,
         persistent_tuples: bool=False) -> Tuple[str, ...]:
 
+    try:
+        schema_cache = _pg_type_cache[schema]
+    except KeyError:
+        schema_cache = _pg_type_cache[schema] = {}
+
+    key = (obj.id, persistent_tuples)
+    result = schema_cache.get(key)
+    if result is None:
+        result = schema_cache[key] = _pg_type_from_object(
+            schema, obj, persistent_tuples)
+
+    return result
+
+
+def _pg_type_from_object(
+        schema: s_schema.Schema,
+        obj: s_obj.Object,
+        persistent_tuples: bool) -> Tuple[str, ...]:
+
     if isinstance(obj, s_scalars.ScalarType):
         return pg_type_from_scalar(schema, obj)
 
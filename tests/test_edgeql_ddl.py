@@ -8419,6 +8419,93 @@ type default::Foo {
                 }
             """)
 
+    async def test_edgeql_ddl_constraint_alter_06(self):
+        # Toggle a constraint on a type with descendants between
+        # delegated and effective, in both directions.
+        await self.con.execute(r"""
+            CREATE ABSTRACT TYPE ToggleBase {
+                CREATE PROPERTY name -> str {
+                    CREATE CONSTRAINT exclusive;
+                };
+            };
+            CREATE TYPE ToggleChild1 EXTENDING ToggleBase;
+            CREATE TYPE ToggleChild2 EXTENDING ToggleBase;
+
+            INSERT ToggleChild1 { name := 'a' };
+        """)
+
+        # Effective on the base: enforced across all descendants.
+        async with self.assertRaisesRegexTx(
+            edgedb.ConstraintViolationError,
+            'name violates exclusivity constraint',
+        ):
+            await self.con.execute(r"""
+                INSERT ToggleChild2 { name := 'a' };
+            """)
+
+        await self.con.execute(r"""
+            ALTER TYPE ToggleBase {
+                ALTER PROPERTY name {
+                    ALTER CONSTRAINT exclusive {
+                        SET DELEGATED;
+                    };
+                };
+            };
+        """)
+
+        # Delegated: enforced separately in each descendant.
+        await self.con.execute(r"""
+            INSERT ToggleChild2 { name := 'a' };
+        """)
+
+        async with self.assertRaisesRegexTx(
+            edgedb.ConstraintViolationError,
+            'name violates exclusivity constraint',
+        ):
+            await self.con.execute(r"""
+                INSERT ToggleChild1 { name := 'a' };
+            """)
+
+        await self.assert_query_result(
+            r"""
+                SELECT ToggleBase.name;
+            """,
+            ['a', 'a'],
+        )
+
+        await self.con.execute(r"""
+            DELETE ToggleChild2;
+
+            ALTER TYPE ToggleBase {
+                ALTER PROPERTY name {
+                    ALTER CONSTRAINT exclusive {
+                        SET NOT DELEGATED;
+                    };
+                };
+            };
+        """)
+
+        # Effective again: enforced across all descendants.
+        async with self.assertRaisesRegexTx(
+            edgedb.ConstraintViolationError,
+            'name violates exclusivity constraint',
+        ):
+            await self.con.execute(r"""
+                INSERT ToggleChild2 { name := 'a' };
+            """)
+
+        async with self.assertRaisesRegexTx(
+            edgedb.ConstraintViolationError,
+            'name violates exclusivity constraint',
+        ):
+            await self.con.execute(r"""
+                INSERT ToggleChild1 { name := 'a' };
+            """)
+
+        await self.con.execute(r"""
+            INSERT ToggleChild2 { name := 'b' };
+        """)
+
     async def test_edgeql_ddl_drop_inherited_link(self):
         await self.con.execute(r"""
             CREATE TYPE Target;
@@ -0,0 +1,49 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2021-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import copy
+import pickle
+import unittest
+
+from edb.ir import ast as irast
+
+
+class TestEdgeQLIRParams(unittest.TestCase):
+    """Unit tests for IR query parameter descriptors."""
+
+    def _make_param(self):
+        # The type fields are opaque to Param itself, so any
+        # picklable values will do.
+        return irast.Param(
+            name='a',
+            required=True,
+            schema_type=None,
+            ir_type=None,
+        )
+
+    def test_edgeql_ir_params_copy_01(self):
+        param = self._make_param()
+
+        for param_copy in (copy.copy(param), copy.deepcopy(param)):
+            self.assertIsNot(param_copy, param)
+            self.assertEqual(param_copy, param)
+
+    def test_edgeql_ir_params_pickle_01(self):
+        param = self._make_param()
+        self.assertEqual(pickle.loads(pickle.dumps(param)), param)
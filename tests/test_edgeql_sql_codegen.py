@@ -0,0 +1,449 @@
+#
+# This source file is part of the EdgeDB open source project.
+#
+# Copyright 2021-present MagicStack Inc. and the EdgeDB authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+
+import functools
+import unittest
+import unittest.mock
+
+from edb import errors
+
+from edb.edgeql import compiler
+from edb.edgeql import parser as qlparser
+from edb.edgeql import qltypes
+
+from edb.ir import ast as irast
+
+from edb.pgsql import compiler as pg_compiler
+from edb.pgsql import delta as pg_delta
+from edb.pgsql.compiler import config as pg_config
+from edb.pgsql.compiler import relctx
+from edb.pgsql.compiler import dispatch
+
+from edb.schema import ddl as s_ddl
+from edb.schema import name as s_name
+from edb.schema import std as s_std
+
+from edb.testbase import lang as tb
+
+
+class TestEdgeQLSQLCodegenDispatch(unittest.TestCase):
+    """Unit tests for the memoized IR -> SQL compiler dispatch."""
+
+    def setUp(self):
+        # Register test handlers in a private registry (with the real
+        # default handler) and memo, so that the compiler's own ones
+        # are left untouched.
+        default = dispatch._compile.registry[object]
+        for attr, value in [
+            ('_compile', functools.singledispatch(default)),
+            ('_compile_handlers', {}),
+        ]:
+            patcher = unittest.mock.patch.object(dispatch, attr, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_edgeql_sql_codegen_dispatch_01(self):
+        class Unregistered(irast.Base):
+            pass
+
+        with self.assertRaisesRegex(
+            NotImplementedError,
+            'no IR compiler handler',
+        ):
+            dispatch.compile(Unregistered(), ctx=None)
+
+        # The default handler is memoized too, and must keep raising.
+        with self.assertRaisesRegex(
+            NotImplementedError,
+            'no IR compiler handler',
+        ):
+            dispatch.compile(Unregistered(), ctx=None)
+
+    def test_edgeql_sql_codegen_dispatch_02(self):
+        class Node(irast.Base):
+            pass
+
+        class SubNode(Node):
+            pass
+
+        @dispatch.register(Node)
+        def compile_Node(ir, *, ctx):
+            return ('Node', ir)
+
+        node = Node()
+        subnode = SubNode()
+
+        self.assertEqual(dispatch.compile(node, ctx=None), ('Node', node))
+        # Subclasses fall back to the handler of the closest base,
+        # both on the first and on the memoized lookup.
+        for _ in range(2):
+            self.assertEqual(
+                dispatch.compile(subnode, ctx=None), ('Node', subnode))
+
+    def test_edgeql_sql_codegen_dispatch_03(self):
+        class Node(irast.Base):
+            pass
+
+        class SubNode(Node):
+            pass
+
+        @dispatch.register(Node)
+        def compile_Node(ir, *, ctx):
+            return 'Node'
+
+        # Populate the memo for SubNode with the inherited handler...
+        self.assertEqual(dispatch.compile(SubNode(), ctx=None), 'Node')
+
+        # ...then register a more specific handler, which must win
+        # over the memoized one.
+        @dispatch.register(SubNode)
+        def compile_SubNode(ir, *, ctx):
+            return 'SubNode'
+
+        self.assertEqual(dispatch.compile(SubNode(), ctx=None), 'SubNode')
+        self.assertEqual(dispatch.compile(Node(), ctx=None), 'Node')
+
+    def test_edgeql_sql_codegen_dispatch_04(self):
+        class Node(irast.Base):
+            pass
+
+        # Registration from annotations, as used by the compiler modules.
+        @dispatch.register
+        def compile_Node(ir: Node, *, ctx) -> str:
+            return 'annotated'
+
+        self.assertEqual(dispatch.compile(Node(), ctx=None), 'annotated')
+
+
+class TestEdgeQLSQLCodegenConfig(unittest.TestCase):
+    """Tests for the SQL generated for CONFIGURE commands."""
+
+    @classmethod
+    def setUpClass(cls):
+        # The test-mode config settings include a backend setting that
+        # is not system-level, so it can be configured in every scope.
+        schema = s_std.load_std_module(
+            tb._load_std_schema(), s_name.UnqualName('_testmode'))
+
+        # A config object with two levels of nested objects, to exercise
+        # nested CONFIGURE INSERT.
+        cls.schema = s_ddl.apply_ddl_script(
+            '''
+            CREATE TYPE cfg::TestNestedLeaf {
+                CREATE REQUIRED PROPERTY name -> std::str;
+            };
+
+            CREATE TYPE cfg::TestNestedOther {
+                CREATE REQUIRED PROPERTY name -> std::str;
+            };
+
+            CREATE TYPE cfg::TestNestedBranch {
+                CREATE REQUIRED PROPERTY name -> std::str;
+                CREATE LINK leaf -> cfg::TestNestedLeaf;
+            };
+
+            CREATE TYPE cfg::TestNestedConfig {
+                CREATE REQUIRED PROPERTY name -> std::str {
+                    CREATE CONSTRAINT std::exclusive;
+                };
+                CREATE LINK branch -> cfg::TestNestedBranch;
+                CREATE LINK other -> cfg::TestNestedOther;
+            };
+
+            ALTER TYPE cfg::AbstractConfig {
+                CREATE MULTI LINK nestedobj -> cfg::TestNestedConfig {
+                    CREATE ANNOTATION cfg::internal := 'true';
+                };
+            };
+            ''',
+            schema=schema,
+            modaliases={},
+            stdmode=True,
+        )
+
+    def _compile_ir(self, source):
+        return compiler.compile_ast_to_ir(
+            qlparser.parse_block(source)[0],
+            self.schema,
+            options=compiler.CompilerOptions(
+                modaliases={None: 'default'},
+            ),
+        )
+
+    def _compile(self, source, **overrides):
+        ir = self._compile_ir(source)
+        for attr, value in overrides.items():
+            setattr(ir, attr, value)
+        sql, _ = pg_compiler.compile_ir_to_sql(ir, pretty=False)
+        return sql
+
+    def assert_sql_contains(self, sql, *fragments):
+        for fragment in fragments:
+            self.assertIn(fragment, sql)
+
+    def test_edgeql_sql_codegen_config_set_01(self):
+        sql = self._compile("""
+            CONFIGURE INSTANCE SET __pg_max_connections := '10';
+        """)
+        self.assertEqual(sql, "ALTER INSTANCE SET max_connections = '10'")
+
+    def test_edgeql_sql_codegen_config_set_02(self):
+        sql = self._compile("""
+            CONFIGURE CURRENT DATABASE SET __pg_max_connections := '10';
+        """)
+        self.assert_sql_contains(
+            sql,
+            "edgedb._alter_current_database_set('max_connections', ",
+        )
+
+    def test_edgeql_sql_codegen_config_set_03(self):
+        sql = self._compile("""
+            CONFIGURE SESSION SET __pg_max_connections := '10';
+        """)
+        self.assert_sql_contains(
+            sql,
+            "pg_catalog.set_config('max_connections', ",
+            ")::text, false)",
+        )
+
+    def test_edgeql_sql_codegen_config_set_04(self):
+        sql = self._compile("""
+            CONFIGURE INSTANCE SET __internal_sess_testvalue := 1;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "jsonb_build_array('SET', 'INSTANCE', "
+            "'__internal_sess_testvalue', ",
+        )
+
+    def test_edgeql_sql_codegen_config_set_05(self):
+        sql = self._compile("""
+            CONFIGURE CURRENT DATABASE SET __internal_sess_testvalue := 1;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "INSERT INTO edgedb._db_config (name, value)",
+            "'__internal_sess_testvalue'",
+            "ON CONFLICT (name) DO UPDATE SET (value) = ROW(",
+        )
+        self.assertNotIn("'C'", sql)
+
+    def test_edgeql_sql_codegen_config_set_06(self):
+        sql = self._compile("""
+            CONFIGURE SESSION SET __internal_sess_testvalue := 1;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "INSERT INTO _edgecon_state (name, value, type)",
+            "'__internal_sess_testvalue'",
+            "'C')",
+            "ON CONFLICT (name, type) DO UPDATE SET (value) = ROW(",
+        )
+
+    def test_edgeql_sql_codegen_config_set_07(self):
+        # Every scope has a handler, so an unexpected one can only
+        # come from a broken IR.
+        with self.assertRaisesRegex(
+            errors.InternalServerError,
+            'unexpected configuration scope',
+        ):
+            self._compile("""
+                CONFIGURE SESSION SET __internal_sess_testvalue := 1;
+            """, scope=None)
+
+    def test_edgeql_sql_codegen_config_reset_01(self):
+        sql = self._compile("""
+            CONFIGURE INSTANCE RESET __pg_max_connections;
+        """)
+        self.assertEqual(sql, "ALTER INSTANCE RESET max_connections")
+
+    def test_edgeql_sql_codegen_config_reset_02(self):
+        sql = self._compile("""
+            CONFIGURE CURRENT DATABASE RESET __pg_max_connections;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "edgedb._alter_current_database_set('max_connections', NULL)",
+        )
+
+    def test_edgeql_sql_codegen_config_reset_03(self):
+        sql = self._compile("""
+            CONFIGURE SESSION RESET __pg_max_connections;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "pg_catalog.set_config('max_connections', NULL, false)",
+        )
+
+    def test_edgeql_sql_codegen_config_reset_04(self):
+        sql = self._compile("""
+            CONFIGURE INSTANCE RESET __internal_sess_testvalue;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "jsonb_build_array('RESET', 'INSTANCE', "
+            "'__internal_sess_testvalue', NULL)",
+        )
+
+    def test_edgeql_sql_codegen_config_reset_05(self):
+        sql = self._compile("""
+            CONFIGURE CURRENT DATABASE RESET __internal_sess_testvalue;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "DELETE FROM",
+            "edgedb._db_config",
+            "(name = '__internal_sess_testvalue')",
+        )
+        self.assertNotIn("(type = 'C')", sql)
+
+    def test_edgeql_sql_codegen_config_reset_06(self):
+        sql = self._compile("""
+            CONFIGURE SESSION RESET __internal_sess_testvalue;
+        """)
+        self.assert_sql_contains(
+            sql,
+            "DELETE FROM",
+            "_edgecon_state",
+            "(name = '__internal_sess_testvalue')",
+            "(type = 'C')",
+        )
+
+    def test_edgeql_sql_codegen_config_reset_07(self):
+        with self.assertRaisesRegex(
+            errors.InternalServerError,
+            'unexpected configuration scope',
+        ):
+            self._compile("""
+                CONFIGURE SESSION RESET __pg_max_connections;
+            """, scope=None)
+
+    def test_edgeql_sql_codegen_config_scopes(self):
+        # Guard against a scope being added without handlers.
+        for scope in qltypes.ConfigScope:
+            for backend in (True, False):
+                key = (scope, backend)
+                self.assertIn(key, pg_config._config_set_handlers)
+                self.assertIn(key, pg_config._config_reset_handlers)
+
+    def test_edgeql_sql_codegen_config_insert_01(self):
+        with unittest.mock.patch.object(
+            relctx, 'add_type_rel_overlay',
+            wraps=relctx.add_type_rel_overlay,
+        ) as add_overlay:
+            sql = self._compile("""
+                CONFIGURE INSTANCE INSERT TestNestedConfig {
+                    name := 'root',
+                    branch := (INSERT TestNestedBranch {
+                        name := 'b',
+                        leaf := (INSERT TestNestedLeaf { name := 'l' }),
+                    }),
+                    other := (INSERT TestNestedOther { name := 'o' }),
+                };
+            """)
+
+        # Every config object gets an id-replacing overlay, in the
+        # pre-order of the nested inserts.
+        replaced = [
+            str(call.args[0].real_material_type.name_hint)
+            for call in add_overlay.call_args_list
+            if call.args[1] == 'replace'
+        ]
+        self.assertEqual(replaced, [
+            'cfg::TestNestedConfig',
+            'cfg::TestNestedBranch',
+            'cfg::TestNestedLeaf',
+            'cfg::TestNestedOther',
+        ])
+        self.assertIn('edgedbext.uuid_generate_v1mc()', sql)
+
+
+class _StubOperator:
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def get_operator_kind(self, schema):
+        return self.kind
+
+
+class TestEdgeQLSQLCodegenOperators(unittest.TestCase):
+    """Tests for the operand expressions of operator proxy functions."""
+
+    def _proxy(self, kind, pgop, from_args):
+        return pg_delta.OperatorCommand().get_proxy_operator_expr(
+            _StubOperator(kind), pgop, from_args, None)
+
+    def _dummy(self, kind, pgop, from_args):
+        return pg_delta.OperatorCommand().get_dummy_operator_call(
+            _StubOperator(kind), pgop, from_args, None)
+
+    def test_edgeql_sql_codegen_operator_proxy_01(self):
+        self.assertEqual(
+            self._proxy(qltypes.OperatorKind.Infix, '+', ('int8', 'int8')),
+            '$1::int8 + $2::int8',
+        )
+
+    def test_edgeql_sql_codegen_operator_proxy_02(self):
+        self.assertEqual(
+            self._proxy(qltypes.OperatorKind.Postfix, '!', ('int8', None)),
+            '$1::int8 !',
+        )
+
+    def test_edgeql_sql_codegen_operator_proxy_03(self):
+        self.assertEqual(
+            self._proxy(qltypes.OperatorKind.Prefix, '-', (None, 'int8')),
+            '- $1::int8',
+        )
+
+    def test_edgeql_sql_codegen_operator_proxy_04(self):
+        with self.assertRaisesRegex(
+            RuntimeError,
+            'unexpected operator kind',
+        ):
+            self._proxy(None, '+', ('int8', 'int8'))
+
+    def test_edgeql_sql_codegen_operator_dummy_01(self):
+        self.assertEqual(
+            self._dummy(
+                qltypes.OperatorKind.Infix,
+                '+',
+                (('int8',), ('edgedb', 'foo_t')),
+            ),
+            'NULL::int8 + NULL::edgedb.foo_t',
+        )
+
+    def test_edgeql_sql_codegen_operator_dummy_02(self):
+        self.assertEqual(
+            self._dummy(qltypes.OperatorKind.Postfix, '!', (('int8',), None)),
+            'NULL::int8 !',
+        )
+
+    def test_edgeql_sql_codegen_operator_dummy_03(self):
+        self.assertEqual(
+            self._dummy(qltypes.OperatorKind.Prefix, '-', (None, ('int8',))),
+            '- NULL::int8',
+        )
+
+    def test_edgeql_sql_codegen_operator_dummy_04(self):
+        with self.assertRaisesRegex(
+            RuntimeError,
+            'unexpected operator kind',
+        ):
+            self._dummy(None, '+', (('int8',), ('int8',)))
@@ -30,6 +30,9 @@ from edb.edgeql import compiler as qlcompiler
 from edb.edgeql import parser as qlparser
 from edb.edgeql import qltypes
 
+from edb.pgsql import delta as pg_delta
+from edb.pgsql import types as pg_types
+
 from edb.schema import ddl as s_ddl
 from edb.schema import links as s_links
 from edb.schema import name as s_name
@@ -1763,6 +1766,69 @@ class TestSchema(tb.BaseSchemaLoadTest):
                 ALTER TYPE Foo EXTENDING Bar;
             ''')
 
+    def test_schema_has_table_cache_01(self):
+        schema = self.load_schema(r'''
+            type Foo {
+                multi property vals := {1, 2};
+            }
+        ''', modname='default')
+
+        foo = schema.get('default::Foo')
+        vals = foo.getptr(schema, s_name.UnqualName('vals'))
+        self.assertFalse(pg_delta.has_table(vals, schema))
+
+        new_schema = self.run_ddl(schema, r'''
+            ALTER TYPE Foo {
+                ALTER PROPERTY vals {
+                    RESET EXPRESSION;
+                };
+            };
+        ''')
+
+        # The property keeps its id, but the memoized result for the
+        # old schema must not leak into the new one.
+        new_vals = new_schema.get_by_id(vals.id)
+        self.assertTrue(pg_delta.has_table(new_vals, new_schema))
+        self.assertFalse(pg_delta.has_table(vals, schema))
+
+    def test_schema_pg_type_cache_01(self):
+        schema = self.load_schema(r'''
+            scalar type foo extending str;
+            type Bar {
+                property foos -> array<foo>;
+            }
+        ''', modname='default')
+
+        foo = schema.get('default::foo')
+        foos_t = schema.get('default::Bar').getptr(
+            schema, s_name.UnqualName('foos')).get_target(schema)
+
+        foo_pg = pg_types.pg_type_from_object(schema, foo)
+        foos_pg = pg_types.pg_type_from_object(schema, foos_t)
+        self.assertNotEqual(foo_pg, ('anynonarray',))
+        self.assertEqual(foos_pg, pg_types.pg_type_array(foo_pg))
+
+        # Backend names of scalar types are derived from their ids, so
+        # no DDL changes the result for an existing type; flip the
+        # abstract flag directly, which keeps the id but turns the
+        # domain into a polymorphic type in the new schema.
+        new_schema = foo.set_field_value(schema, 'abstract', True)
+
+        self.assertEqual(
+            pg_types.pg_type_from_object(new_schema, foo),
+            ('anynonarray',),
+        )
+        self.assertEqual(
+            pg_types.pg_type_from_object(new_schema, foos_t),
+            ('anyarray',),
+        )
+
+        # Results memoized for the new schema must not leak back
+        # into the old one either.
+        self.assertEqual(pg_types.pg_type_from_object(schema, foo), foo_pg)
+        self.assertEqual(
+            pg_types.pg_type_from_object(schema, foos_t), foos_pg)
+
 
 class TestGetMigration(tb.BaseSchemaLoadTest):
     """Test migration deparse consistency.